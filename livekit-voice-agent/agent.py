@@ -5,7 +5,7 @@ The simplest possible LiveKit voice agent to get you started.
 Requires only OpenAI and Deepgram API keys.
 """
 
-from typing import Any, AsyncIterable, Optional
+from typing import TYPE_CHECKING, Any, AsyncIterable, Callable, Optional
 from dotenv import load_dotenv
 from livekit import agents
 from livekit.agents import (
@@ -18,110 +18,135 @@ from livekit.agents import (
 )
 from livekit.agents import Agent, AgentSession, ModelSettings
 from livekit.agents import log as agents_log
-from jose import jwt
 
 logger = agents_log.logger
 from livekit.plugins import silero
-from session_manager import get_session_manager
-from mcp_client import get_mcp_client
-from agno_tools import create_agno_mcp_tools
-from agno.agent import Agent as AgnoAgent
-from agno.models.openai import OpenAIChat
-from ai_gateway import AIGateway
+from session_manager import SessionWriteBehind, get_session_manager
+from mcp_client import close_mcp_client, get_mcp_client
+import pii_masking
 from pii_masking import sanitize_text, is_pii_masking_enabled
-from elicitation_manager import get_elicitation_manager
-from elicitation_response_handler import get_response_handler
-from agno_redis_storage import get_agno_storage
+import fast_json
+from schemas.elicitation import ElicitationSchema
+
+if TYPE_CHECKING:
+    from agno.agent import Agent as AgnoAgent
 
 from datetime import datetime, timedelta, timezone
 import os
-import json
+import logging
+import asyncio
+import contextlib
+import base64
+import functools
+import hashlib
+import re
+import sys
 
 # Load environment variables
 load_dotenv()
 
+# Use uvloop for cheaper task scheduling and socket I/O when it is installed
+# (pip install "livekit-voice-agent[speedups]"). Set at import so LiveKit's job
+# processes, which import this module, run their event loops on it too.
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
 
+# Environment-driven settings, read once at import (see reload_config)
+_AI_MODEL_ID = os.getenv("AI_MODEL_ID", "gpt-4.1-mini")
+_AI_MODEL_NAME = os.getenv("AI_MODEL_NAME", "GPT-4.1 Mini")
+_DEFAULT_USER_ID = os.getenv("DEFAULT_USER_ID", "12345")
+_OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+_PII_MASKING = is_pii_masking_enabled()
+# Seconds Agno may go without any progress (a tool call starting or finishing, or text)
+# before its first text output; after that the default LLM answers instead
+_AGNO_FIRST_CHUNK_TIMEOUT = float(os.getenv("AGNO_FIRST_CHUNK_TIMEOUT", "30"))
 
-class Assistant(Agent):
-    """Banking voice assistant with comprehensive financial services."""
 
-    def __init__(self):
-        super().__init__(
-            instructions="""You are a helpful and professional banking voice assistant.
-            You can help customers with account balances, payments, transfers, transaction history,
-            loan inquiries, and setting up payment reminders. Keep responses clear and professional."""
-        )
+def _parse_tool_groups(value: Optional[str]) -> Optional[tuple[str, ...]]:
+    """Parse a comma-separated AGNO_TOOL_GROUPS value; unset or empty means all tools."""
+    groups = tuple(group.strip() for group in (value or "").split(",") if group.strip())
+    return groups or None
 
-        # MCP client for calling banking tools
-        self.mcp_client = get_mcp_client()
-        
-        # Store user_id, email, and session_id for MCP calls
-        # These will be set when the agent session starts
-        self.user_id: Optional[str] = None
-        self.email: Optional[str] = None
-        self.session_id: Optional[str] = None
-        
-        # Agno agent will be initialized when user context is available
-        self.agno_agent: Optional[AgnoAgent] = None
-        
-        # Room reference for sending data channel messages (elicitations)
-        self.room: Optional[Any] = None
-        
-        # Log PII masking status
-        if is_pii_masking_enabled():
-            logger.info("🛡️ PII masking is ENABLED")
-        else:
-            logger.info("ℹ️ PII masking is DISABLED (set ENABLE_PII_MASKING=true to enable)")
-    
-    async def _initialize_agno_agent(self):
-        """Initialize Agno agent with MCP server tools when user context is available."""
-        if self.agno_agent is None:
-            if not self.user_id or not self.session_id:
-                logger.warning("Cannot initialize Agno agent: user_id or session_id not set")
-                logger.warning(f"user_id={self.user_id}, session_id={self.session_id}")
-                return
-            
-            # Create MCP tools wrapper
-            mcp_tools_wrapper = create_agno_mcp_tools(
-                self.user_id, 
-                self.session_id,
-            )
-            
-            # Get list of Function objects (these use our HTTP client with JWT)
-            mcp_tools = mcp_tools_wrapper.get_tools()
-            # Get model ID from environment or use default (gpt-4.1-mini for gateway)
-            model_id = os.getenv("AI_MODEL_ID", "gpt-4.1-mini")
-            
-            # Try to use AI Gateway if configured, otherwise fall back to OpenAI
-            try:
-                # Use AI Gateway with proper URL structure and headers
-                # agent_id is None, so AIGateway will use hardcoded constant UUID
-                model = AIGateway(model_id=model_id)
-            except ValueError as e:
-                # AI Gateway not configured, fall back to OpenAI
-                logger.warning(f"AI Gateway not configured ({e}), falling back to OpenAI")
-                openai_api_key = os.getenv("OPENAI_API_KEY")
-                if not openai_api_key:
-                    raise ValueError("Neither AI Gateway nor OPENAI_API_KEY is configured")
-                
-                model = OpenAIChat(
-                    id=model_id,
-                    name=os.getenv("AI_MODEL_NAME", "GPT-4.1 Mini"),
-                    api_key=openai_api_key,
-                )
-            
-            # Get Redis database for session persistence
-            agno_storage = get_agno_storage()
-            db = agno_storage.get_db()
-            
-            # Initialize Agno agent with model (via AI Gateway or OpenAI) and MCP tools
-            # Configure with Redis database for conversation memory
-            # Based on Agno docs: https://docs.agno.com/concepts/agents/sessions
-            self.agno_agent = AgnoAgent(
-                name="banking_assistant",
-                model=model,
-                tools=mcp_tools,  # List of Function objects that call MCP server via HTTP with JWT
-                instructions="""You are a helpful and professional banking voice assistant.
+
+# MCP tool groups registered with the Agno agent (read, payments, reminders, meta)
+_AGNO_TOOL_GROUPS = _parse_tool_groups(os.getenv("AGNO_TOOL_GROUPS"))
+# Offer the parameterless read tools through one banking_read tool (fewer tool schemas)
+_AGNO_COMPACT_READ_TOOLS = os.getenv("AGNO_COMPACT_READ_TOOLS", "false").lower() in ("true", "1", "yes")
+
+# Log PII masking status once per process rather than once per room
+if _PII_MASKING:
+    logger.info("🛡️ PII masking is ENABLED")
+else:
+    logger.info("ℹ️ PII masking is DISABLED (set ENABLE_PII_MASKING=true to enable)")
+
+# How many trailing chat items to inspect when looking for the latest user turn
+_USER_MESSAGE_LOOKBACK = 4
+
+# Streamed text is sanitized per sentence; flush early if a sentence runs past this size.
+# Shared by llm_node and tts_node so both passes see the same segments.
+_TTS_MAX_BUFFER_CHARS = 120
+# Sentence ends: terminal punctuation followed by whitespace (so "3.50" or "a@b.com" are
+# never split), or a newline
+_SENTENCE_END_RE = re.compile(r"[.!?](?=\s)|\n")
+# Where an over-long sentence may be cut: whitespace not next to a digit, so spaced card
+# and phone numbers reach the masker in one piece
+_SOFT_BREAK_RE = re.compile(r"(?<!\d)\s(?!\d)")
+
+# Phrases marking a system/assistant chat message as a generate_reply() instruction
+_INSTRUCTION_KEYWORDS = ("SYSTEM:", "Inform the user", "Great news", "Tell the user", "Acknowledge")
+_INSTRUCTION_KEYWORDS_RE = re.compile("|".join(map(re.escape, _INSTRUCTION_KEYWORDS)))
+# Longer system/assistant messages about these topics are treated as instructions too
+_INSTRUCTION_TOPIC_RE = re.compile(r"payment|transaction", re.IGNORECASE)
+
+# Spoken instead of the model's reply when a tool call needs user confirmation on the device
+_ELICITATION_SENT_MESSAGE = (
+    "I've sent a payment confirmation request to your device. "
+    "Please review the details and enter the OTP code to complete the transaction."
+)
+
+# Pending elicitation responses per room before new ones are dropped
+_ELICITATION_QUEUE_SIZE = 64
+
+# Text chunks buffered between the Agno run and LiveKit; keeps Agno at most a few
+# deltas ahead of what TTS has consumed
+_AGNO_STREAM_QUEUE_SIZE = 4
+_STREAM_END = object()
+# Queued when Agno starts or finishes a tool call, so a run that chains several tools
+# before saying anything is not mistaken for a hung one
+_STREAM_HEARTBEAT = object()
+_TOOL_CALL_EVENTS = frozenset({"ToolCallStarted", "ToolCallCompleted"})
+
+# Data channel message type sent by the client when answering an elicitation,
+# and the fields read from it
+_ELICITATION_RESPONSE_TYPE = sys.intern("elicitation_response")
+_ELICITATION_RESPONSE_FIELDS = ("elicitation_id", "user_input", "biometric_token")
+
+# Simulated user turns announcing a completed payment (see handle_elicitation_response)
+_PAYMENT_CONFIRMED_USER_MESSAGE = (
+    "I've confirmed the payment of {amount} from {from_account} "
+    "to {to_account}. The confirmation number is {confirmation}."
+)
+_PAYMENT_CONFIRMED_SHORT_MESSAGE = "Payment of {amount} confirmed. Confirmation number {confirmation}."
+_PAYMENT_FAILED_USER_MESSAGE = "Payment confirmation failed: {error}. Please help me retry."
+
+# Participant metadata that is a (Bearer) JWT rather than JSON; group 1 is the bare token
+_JWT_METADATA_RE = re.compile(r"\s*(?:Bearer\s+)?(eyJ[\w-]*\.[\w-]*\.[\w-]*)\s*$")
+
+
+# Instructions for the LiveKit agent itself (used when llm_node falls back to the default LLM)
+_VOICE_ASSISTANT_INSTRUCTIONS = (
+    "You are a helpful and professional banking voice assistant. "
+    "You can help customers with account balances, payments, transfers, transaction history, "
+    "loan inquiries, and setting up payment reminders. Keep responses clear and professional."
+)
+
+# System prompt for the Agno banking agent. Kept as a single module-level constant so it
+# is built once and sent byte-identical on every run: OpenAI caches a repeated prompt
+# prefix automatically, which keeps first-token latency down on later turns.
+_ASSISTANT_INSTRUCTIONS = """You are a helpful and professional banking voice assistant.
 
 IMPORTANT: You MUST use the available tools to perform banking operations. Do not make up or guess information.
 
@@ -170,7 +195,7 @@ DATE HANDLING (CRITICAL):
 
 DATE FORMATTING IN RESPONSES (CRITICAL):
 - ALWAYS format dates in human-readable format when speaking to users
-- NEVER read dates in raw format (e.g., "2025-11-25", "25/11/25", "2025-11-25T10:30:00Z")
+- NEVER read dates in raw format (e.g., "2025-11-25", "25/11/25", "2025-11-25T10:30:00Z"); always convert ISO dates before speaking
 - Convert dates to natural format: "November 25, 2025" or "Nov 25, 2025"
 - For times, use: "November 25, 2025 at 10:30 AM" or "Nov 25, 2025 at 2:30 PM"
 - Examples of date conversion:
@@ -181,7 +206,8 @@ DATE FORMATTING IN RESPONSES (CRITICAL):
 - Use relative time when appropriate (e.g., "yesterday", "3 days ago", "next week") based on current date
 
 CURRENT DATE/TIME AWARENESS:
-- When you need to know the current date/time for context (e.g., to calculate relative dates, determine if something is overdue, etc.), call the get_current_date_time tool
+- When you need to know the current date/time for context (e.g., to calculate relative dates, determine if something is overdue or upcoming), call the get_current_date_time tool
+- Call it BEFORE reading transactions, loans, or reminders to provide better context
 - Use current date/time to provide context in responses (e.g., "Your next payment is due in 5 days" instead of just "Your next payment is on December 28")
 - When reading transaction history, use current date to provide relative context (e.g., "3 days ago" instead of just the date)
 
@@ -190,7 +216,6 @@ When a user asks about:
 - Transaction history → Use the get_transactions tool (ALWAYS format dates in human-readable format when reading results)
 - Loans → Use the get_loans tool (ALWAYS format payment dates in human-readable format, use get_current_date_time to provide relative context)
 - Credit limits → Use the get_credit_limit tool
-- Interest rates → Use the get_interest_rates tool
 - User profile/details → Use the get_user_details tool
 - Current date/time → Use the get_current_date_time tool (call this when you need current date context for relative dates)
 - Making payments → Use the initiate_payment tool (collect from_account, to_account, amount first; description optional)
@@ -200,40 +225,26 @@ When a user asks about:
 - Deleting reminders → Use the delete_reminder tool (requires reminder_id)
 
 RESPONSE FORMATTING FOR READ OPERATIONS:
-- When reading transactions: 
+- When reading transactions:
   * Format dates as "November 25, 2025" or "Nov 25, 2025"
   * Use relative time when helpful (e.g., "3 days ago", "last week")
   * Example: Instead of "Transaction on 2025-11-20", say "Transaction on November 20, 2025" or "Transaction from 3 days ago"
   * Call get_current_date_time if you need to calculate relative dates
-  
+
 - When reading loans:
-  * Format next payment date as "December 28, 2025" 
+  * Format next payment date as "December 28, 2025"
   * ALWAYS call get_current_date_time first to provide relative context
   * Example: "Your next payment of $500 is due on December 28, 2025, which is in 5 days"
   * Instead of "next_payment_date: 2025-12-28", say "December 28, 2025" or "Dec 28, 2025"
-  
+
 - When reading reminders:
   * Format scheduled dates as "January 15, 2026" or "Jan 15, 2026"
   * Call get_current_date_time to provide relative context
   * Example: "You have a reminder scheduled for January 15, 2026, which is in 3 weeks"
-  
+
 - When reading contacts/beneficiaries:
   * Format any dates in human-readable format
   * No need to call get_current_date_time unless providing relative context
-  
-- Date conversion rules:
-  * "2025-11-25" → "November 25, 2025" or "Nov 25, 2025"
-  * "2025-11-25T14:30:00Z" → "November 25, 2025 at 2:30 PM"
-  * "2025-12-20T10:00:00Z" → "December 20, 2025 at 10:00 AM"
-  * Always convert ISO dates (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SSZ) to human-readable format before speaking
-  * NEVER read raw date formats like "25/11/25", "2025-11-25", or ISO timestamps directly
-  
-- Current date/time usage:
-  * Call get_current_date_time tool when you need to:
-    - Calculate relative dates (e.g., "3 days ago", "in 5 days")
-    - Determine if something is overdue or upcoming
-    - Provide context about when something happened relative to now
-  * Use it BEFORE reading transactions, loans, or reminders to provide better context
 
 WORKFLOW FOR WRITE OPERATIONS:
 1. User expresses intent (e.g., "create a reminder", "update my reminder", "delete a reminder")
@@ -279,18 +290,288 @@ Step 4: initiate_payment(from_account="checking", to_account="john@okicici.com",
 
 Always call the appropriate tool first, then use the tool's response to answer the user's question. Never provide information without calling the tools first.
 
-Keep responses clear, professional, and based on actual tool responses.""",
-                markdown=True,
-                # Session and database configuration for conversation memory
-                db=db,  # Redis database for persistent memory
-                session_id=self.session_id,  # Use room_name as session_id to maintain context across the conversation
-                user_id=self.user_id,  # Track sessions per user
-                add_history_to_context=True,  # Include conversation history in context
-                num_history_runs=10,  # Keep last 10 exchanges in memory
-                # Add session state for maintaining conversation context
-                add_session_state_to_context=True,
-                session_state={},  # Initialize empty state that will be persisted
-            )
+Keep responses clear, professional, and based on actual tool responses."""
+
+# Stable key for the shared system prompt; sent with model requests so the provider can
+# route every session to the same prompt-prefix cache
+_ASSISTANT_INSTRUCTIONS_CACHE_KEY = hashlib.blake2b(
+    _ASSISTANT_INSTRUCTIONS.encode("utf-8"), digest_size=16
+).hexdigest()
+
+
+@functools.lru_cache(maxsize=8)
+def _get_model(model_id: str):
+    """
+    Get the Agno model client for model_id (AI Gateway if configured, otherwise OpenAI).
+    Cached so every session in this worker reuses the same client and connection pool.
+    """
+    from ai_gateway import AIGateway
+    
+    # Try to use AI Gateway if configured, otherwise fall back to OpenAI
+    try:
+        # Use AI Gateway with proper URL structure and headers
+        # agent_id is None, so AIGateway will use hardcoded constant UUID
+        return AIGateway(model_id=model_id, prompt_cache_key=_ASSISTANT_INSTRUCTIONS_CACHE_KEY)
+    except ValueError as e:
+        # AI Gateway not configured, fall back to OpenAI
+        logger.warning(f"AI Gateway not configured ({e}), falling back to OpenAI")
+        if not _OPENAI_API_KEY:
+            raise ValueError("Neither AI Gateway nor OPENAI_API_KEY is configured")
+        
+        from agno.models.openai import OpenAIChat
+        return OpenAIChat(
+            id=model_id,
+            name=_AI_MODEL_NAME,
+            api_key=_OPENAI_API_KEY,
+            extra_body={"prompt_cache_key": _ASSISTANT_INSTRUCTIONS_CACHE_KEY},
+        )
+
+
+def reload_config() -> None:
+    """Re-read the environment-driven settings (e.g. after changing env vars in tests)."""
+    global _AI_MODEL_ID, _AI_MODEL_NAME, _DEFAULT_USER_ID, _OPENAI_API_KEY, _AGNO_FIRST_CHUNK_TIMEOUT
+    global _AGNO_TOOL_GROUPS, _AGNO_COMPACT_READ_TOOLS
+    _AI_MODEL_ID = os.getenv("AI_MODEL_ID", "gpt-4.1-mini")
+    _AI_MODEL_NAME = os.getenv("AI_MODEL_NAME", "GPT-4.1 Mini")
+    _DEFAULT_USER_ID = os.getenv("DEFAULT_USER_ID", "12345")
+    _OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    _AGNO_FIRST_CHUNK_TIMEOUT = float(os.getenv("AGNO_FIRST_CHUNK_TIMEOUT", "30"))
+    _AGNO_TOOL_GROUPS = _parse_tool_groups(os.getenv("AGNO_TOOL_GROUPS"))
+    _AGNO_COMPACT_READ_TOOLS = os.getenv("AGNO_COMPACT_READ_TOOLS", "false").lower() in ("true", "1", "yes")
+    from ai_gateway import reload_config as reload_gateway_config
+    reload_gateway_config()
+    # Model clients were built from the previous settings
+    _get_model.cache_clear()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_db():
+    """Get the Agno Redis database used for session persistence."""
+    from agno_redis_storage import get_agno_storage
+    return get_agno_storage().get_db()
+
+
+# Agno agents keyed by (user_id, session_id). Runs pass session_id/user_id explicitly,
+# but the MCP tools are bound to the user/session (their JWTs embed both), so an agent
+# is only reused for the same pair, e.g. when the room reconnects. Entries are evicted
+# when the job shuts down.
+_AGENT_CACHE: dict[tuple[str, str], "AgnoAgent"] = {}
+_AGENT_CACHE_LOCK = asyncio.Lock()
+
+
+def evict_agno_agent(user_id: Optional[str], session_id: Optional[str]) -> None:
+    """Drop the cached Agno agent for a user/session pair."""
+    _AGENT_CACHE.pop((user_id, session_id), None)
+
+
+@functools.lru_cache(maxsize=1024)
+def _get_unverified_jwt_claims(token: str) -> dict:
+    """
+    Decode the payload segment of a JWT without verifying its signature
+    (equivalent to jose's get_unverified_claims, without the import cost).
+    """
+    # header.payload.signature; like jose, reject anything that is not three segments
+    segments = token.split(".", 2)
+    if len(segments) != 3 or "." in segments[2]:
+        raise ValueError("Malformed JWT")
+    payload = segments[1]
+    padding = "=" * (-len(payload) % 4)
+    claims = fast_json.loads(base64.urlsafe_b64decode(payload + padding))
+    if not isinstance(claims, dict):
+        raise ValueError("JWT payload is not a JSON object")
+    return claims
+
+
+# Elicitation manager, resolved on first use (the module is imported lazily, see prewarm)
+_elicitation_manager = None
+
+
+def _get_elicitation_manager():
+    """Get the elicitation manager, importing and connecting it on first use."""
+    global _elicitation_manager
+    if _elicitation_manager is None:
+        from elicitation_manager import get_elicitation_manager
+        _elicitation_manager = get_elicitation_manager()
+    return _elicitation_manager
+
+
+def _is_generate_reply_instruction(text: str) -> bool:
+    """Check if a system/assistant chat message is an instruction passed via generate_reply()."""
+    # Check for common instruction patterns
+    if _INSTRUCTION_KEYWORDS_RE.search(text):
+        return True
+    # Also check if it's a direct instruction (not a user message)
+    return len(text) > 20 and _INSTRUCTION_TOPIC_RE.search(text) is not None
+
+
+async def _mask_by_sentence(text: AsyncIterable[str], mask) -> AsyncIterable[str]:
+    """
+    Re-chunk a token stream into sentences and apply mask to each one, so the sanitizer
+    runs once per sentence and PII split across tokens is still detected.
+    A large chunk (e.g. a whole fallback reply) is masked in one call up to its last
+    sentence end, so the sanitizer sees the full text rather than fixed-size slices.
+    """
+    buffer = ""
+    scan_from = 0
+    async for chunk in text:
+        buffer += chunk
+        cut = -1
+        for match in _SENTENCE_END_RE.finditer(buffer, scan_from):
+            cut = match.end()
+        if cut == -1:
+            # Only rescan the new text next time (the last char may be a terminator
+            # whose following whitespace has not arrived yet)
+            scan_from = max(len(buffer) - 1, 0)
+            if len(buffer) >= _TTS_MAX_BUFFER_CHARS:
+                # No sentence end in sight; flush at a word break to bound time-to-first-audio
+                for match in _SOFT_BREAK_RE.finditer(buffer):
+                    cut = match.end()
+                if cut == -1:
+                    cut = len(buffer)
+        if cut != -1:
+            segment, buffer = buffer[:cut], buffer[cut:]
+            scan_from = 0
+            yield mask(segment)
+    if buffer:
+        yield mask(buffer)
+
+
+class Assistant(Agent):
+    """Banking voice assistant with comprehensive financial services."""
+
+    def __init__(self):
+        super().__init__(instructions=_VOICE_ASSISTANT_INSTRUCTIONS)
+
+        # MCP client for calling banking tools
+        self.mcp_client = get_mcp_client()
+        
+        # Store user_id, email, and session_id for MCP calls
+        # These will be set when the agent session starts
+        self.user_id: Optional[str] = None
+        self.email: Optional[str] = None
+        self.session_id: Optional[str] = None
+        
+        # Agno agent will be initialized when user context is available
+        self.agno_agent: Optional["AgnoAgent"] = None
+        self._agno_init_task: Optional[asyncio.Task] = None
+        
+        # Room reference for sending data channel messages (elicitations)
+        self.room: Optional[Any] = None
+        self.participant_identity: Optional[str] = None
+        
+        # Index of the last user message seen in the chat context (see _extract_turn_input)
+        self._last_user_idx: int = -1
+        
+        # PII masking is decided once per process; _mask is a no-op when it is off
+        self._pii_masking = _PII_MASKING
+        self._mask = sanitize_text if self._pii_masking else (lambda text: text)
+    
+    def start_agno_initialization(self):
+        """
+        Start building the Agno agent in the background once user context is set,
+        so it overlaps with session startup instead of delaying the first reply.
+        """
+        if self._agno_init_task is None:
+            self._agno_init_task = asyncio.create_task(self._initialize_agno_agent_in_background())
+    
+    async def _initialize_agno_agent_in_background(self):
+        try:
+            await self._initialize_agno_agent()
+        except Exception as e:
+            # llm_node retries the initialization and falls back if it fails again
+            logger.error(f"Background Agno agent initialization failed: {e}")
+    
+    async def _initialize_agno_agent(self):
+        """Initialize Agno agent with MCP server tools when user context is available."""
+        if self.agno_agent is None:
+            if not self.user_id or not self.session_id:
+                logger.warning("Cannot initialize Agno agent: user_id or session_id not set")
+                logger.warning(f"user_id={self.user_id}, session_id={self.session_id}")
+                return
+            
+            key = (self.user_id, self.session_id)
+            async with _AGENT_CACHE_LOCK:
+                self.agno_agent = _AGENT_CACHE.get(key)
+                if self.agno_agent is None:
+                    self.agno_agent = self._build_agno_agent()
+                    _AGENT_CACHE[key] = self.agno_agent
+    
+    def _build_agno_agent(self) -> "AgnoAgent":
+        """Build the Agno agent with MCP server tools for the current user/session."""
+        from agno.agent import Agent as AgnoAgent
+        from agno_tools import create_agno_mcp_tools
+        
+        # Create MCP tools wrapper
+        mcp_tools_wrapper = create_agno_mcp_tools(
+            self.user_id, 
+            self.session_id,
+            groups=_AGNO_TOOL_GROUPS,
+            compact_reads=_AGNO_COMPACT_READ_TOOLS,
+            # Payment outcomes are narrated once, by handle_elicitation_response when
+            # the client answers; llm_node drops model text after an elicitation, so
+            # an await_elicitation result would never be spoken anyway
+            await_elicitation=False,
+        )
+        
+        # Get list of Function objects (these use our HTTP client with JWT)
+        mcp_tools = mcp_tools_wrapper.get_tools()
+        # Model client and Redis database are shared by every session in this worker
+        model = _get_model(_AI_MODEL_ID)
+        db = _get_db()
+        
+        # Initialize Agno agent with model (via AI Gateway or OpenAI) and MCP tools
+        # Configure with Redis database for conversation memory
+        # Based on Agno docs: https://docs.agno.com/concepts/agents/sessions
+        return AgnoAgent(
+            name="banking_assistant",
+            model=model,
+            tools=mcp_tools,  # List of Function objects that call MCP server via HTTP with JWT
+            instructions=_ASSISTANT_INSTRUCTIONS,
+            markdown=True,
+            # Session and database configuration for conversation memory
+            db=db,  # Redis database for persistent memory
+            session_id=self.session_id,  # Use room_name as session_id to maintain context across the conversation
+            user_id=self.user_id,  # Track sessions per user
+            add_history_to_context=True,  # Include conversation history in context
+            num_history_runs=10,  # Keep last 10 exchanges in memory
+            # Add session state for maintaining conversation context
+            add_session_state_to_context=True,
+            session_state={},  # Initialize empty state that will be persisted
+        )
+    
+    def _extract_turn_input(self, items: list) -> tuple[Optional[str], Optional[str]]:
+        """
+        Find what to send to Agno in a single backwards pass over the chat items.
+        
+        Returns (user_message, instruction): the latest user message if there is one
+        within the lookback window, otherwise the latest generate_reply instruction
+        (a system/assistant message), otherwise (None, None).
+        New input is always appended, so user messages are only looked for in the last
+        few items, and never further back than the one found on the previous turn.
+        """
+        lower = max(len(items) - _USER_MESSAGE_LOOKBACK, 0)
+        if lower <= self._last_user_idx < len(items):
+            lower = self._last_user_idx
+        instruction = None
+        for idx in range(len(items) - 1, -1, -1):
+            item = items[idx]
+            # Function calls/outputs and other chat items are skipped with one type check
+            if not isinstance(item, llm.ChatMessage):
+                continue
+            role = item.role
+            if role == "user":
+                if idx >= lower:
+                    text = item.text_content
+                    if text:
+                        self._last_user_idx = idx
+                        return text, None
+            elif instruction is None and (role == "system" or role == "assistant"):
+                text = item.text_content
+                if text and _is_generate_reply_instruction(text):
+                    instruction = text
+            if instruction is not None and idx <= lower:
+                break
+        return None, instruction
     
     async def llm_node(
         self, 
@@ -303,8 +584,13 @@ Keep responses clear, professional, and based on actual tool responses.""",
         Optionally sanitizes the chat context so the LLM never sees the raw PII (if enabled).
         Agno automatically handles tool calling based on tool definitions.
         """
-        # Ensure Agno agent is initialized (async)
-        await self._initialize_agno_agent()
+        # Ensure Agno agent is initialized (async), waiting for the eager init if still running.
+        # Once it is, later turns skip the init coroutine entirely.
+        if self.agno_agent is None:
+            if self._agno_init_task is not None and not self._agno_init_task.done():
+                await self._agno_init_task
+            if self.agno_agent is None:
+                await self._initialize_agno_agent()
         
         if not self.agno_agent:
             # Fallback to default if Agno not initialized
@@ -313,39 +599,16 @@ Keep responses clear, professional, and based on actual tool responses.""",
             return super().llm_node(chat_ctx, tools, model_settings)
         
         # Extract user message from LiveKit context
-        user_message = None
-        items = chat_ctx.items
-        if items:
-            # Find the last user message
-            for item in reversed(items):
-                if hasattr(item, 'type') and item.type == 'message' and hasattr(item, 'role'):
-                    if item.role == "user":
-                        user_message = item.text_content
-                        if user_message:
-                            # Optionally sanitize PII before sending to Agno (if enabled)
-                            sanitized_message = sanitize_text(user_message)
-                            user_message = sanitized_message
-                        break
-        
-        # Check if this is a generate_reply call (instructions provided via system/assistant message)
-        # generate_reply() may pass instructions as system messages or assistant messages
-        if not user_message and items:
-            for item in reversed(items):
-                if hasattr(item, 'type') and item.type == 'message' and hasattr(item, 'role'):
-                    if item.role == "system" or item.role == "assistant":
-                        # Check if this is an instruction for generate_reply
-                        instruction_text = getattr(item, 'text_content', None) or getattr(item, 'content', None)
-                        if instruction_text:
-                            # Check for common instruction patterns
-                            if any(keyword in instruction_text for keyword in ["SYSTEM:", "Inform the user", "Great news", "Tell the user", "Acknowledge"]):
-                                user_message = instruction_text
-                                logger.info(f"Detected generate_reply instruction: {instruction_text[:150]}...")
-                                break
-                            # Also check if it's a direct instruction (not a user message)
-                            elif len(instruction_text) > 20 and ("payment" in instruction_text.lower() or "transaction" in instruction_text.lower()):
-                                user_message = instruction_text
-                                logger.info(f"Detected potential instruction message: {instruction_text[:150]}...")
-                                break
+        # If there is none, check if this is a generate_reply call (instructions provided
+        # via system/assistant message)
+        user_message, instruction = self._extract_turn_input(chat_ctx.items)
+        if user_message:
+            # Optionally sanitize PII before sending to Agno (if enabled)
+            sanitized_message = self._mask(user_message)
+            user_message = sanitized_message
+        elif instruction:
+            user_message = instruction
+            logger.info(f"Detected generate_reply instruction: {instruction[:150]}...")
         
         # If no user message, this might be an initial greeting or generate_reply call
         # Still use Agno agent so it can call get_user_details for personalized greeting
@@ -353,200 +616,283 @@ Keep responses clear, professional, and based on actual tool responses.""",
             user_message = ""  # Empty message, but we'll still call Agno
             logger.debug("No user message found, using empty string for Agno")
         
-        # Run Agno agent with user message
+        # Run Agno agent with user message, streaming its output
         # Agno will automatically call MCP tools as needed
-        try:
-            # Log that we're about to call Agno
-            logger.info(f"Calling Agno agent with message: {user_message[:100]}...")
-            
-            # Run Agno agent - it should automatically call tools
+        logger.info(f"Calling Agno agent with message: {user_message[:100]}...")
+        # Per-turn state bound once; the generators below read these for every event
+        agno_agent = self.agno_agent
+        session_id = self.session_id
+        user_id = self.user_id
+        mask = self._mask
+        pii_masking = self._pii_masking
+        find_elicitation = self._find_elicitation
+        fallback_llm_node = super().llm_node
+        
+        async def agno_event_stream(heartbeat: Callable[[], None]):
+            # Text deltas are yielded as soon as Agno produces them so TTS can start on the
+            # first sentence. Tool results are inspected on the side for elicitations.
             # Note: Since our tools are async, we must use arun() instead of run()
-            logger.info(f"Running Agno agent.arun() with message: {user_message[:50]}...")
-            response = await self.agno_agent.arun(user_message)
-            
-            # Log the response
-            logger.info(f"Agno agent responded. Response type: {type(response)}")
-            logger.info(f"Response attributes: {dir(response)}")
-            
-            if hasattr(response, 'content'):
-                logger.info(f"Response content length: {len(str(response.content))}")
-                logger.info(f"Response content (first 200 chars): {str(response.content)[:200]}")
-            if hasattr(response, 'messages'):
-                logger.info(f"Response messages: {len(response.messages) if response.messages else 0}")
-            
-            # Check if any tool calls resulted in elicitation
             elicitation_response = None
+            elicitation_tasks = []
+            try:
+                # session_id/user_id are passed per run so the run is always stored against
+                # this room's session, whatever the agent was constructed with
+                async for event in agno_agent.arun(
+                    user_message,
+                    stream=True,
+                    stream_intermediate_steps=True,
+                    session_id=session_id,
+                    user_id=user_id,
+                ):
+                    event_type = getattr(event, "event", None)
+                    if event_type in _TOOL_CALL_EVENTS:
+                        heartbeat()
+                    if event_type == "ToolCallCompleted":
+                        if elicitation_response is None:
+                            elicitation_response = find_elicitation(event.tool)
+                            if elicitation_response:
+                                # Save to Redis and publish to the UI while the voice reply starts
+                                elicitation_tasks = [
+                                    asyncio.create_task(self._save_elicitation(elicitation_response)),
+                                    asyncio.create_task(self._publish_elicitation(elicitation_response)),
+                                ]
+                                # Tell the user to check their device instead of the model's own wording
+                                yield _ELICITATION_SENT_MESSAGE
+                    elif event_type == "RunContent" and elicitation_response is None:
+                        if isinstance(event.content, str) and event.content:
+                            yield event.content
+                    # Keep consuming after an elicitation so Agno completes and stores the run
+            finally:
+                if elicitation_tasks:
+                    # Both helpers log their own failures
+                    await asyncio.gather(*elicitation_tasks, return_exceptions=True)
+        
+        async def produce_chunks(queue: asyncio.Queue):
+            # Runs the Agno stream in its own task so LiveKit gets each chunk as soon as
+            # it is queued; errors are handed to the consumer to decide on a fallback
+            def heartbeat():
+                # A full queue already holds output for the consumer, so skip it then
+                try:
+                    queue.put_nowait(_STREAM_HEARTBEAT)
+                except asyncio.QueueFull:
+                    pass
             
-            # Try different attributes where tool results might be stored
-            tools_attr = None
-            if hasattr(response, 'tools'):
-                tools_attr = response.tools
-                logger.info(f"Found 'tools' attribute with {len(tools_attr) if tools_attr else 0} items")
-            elif hasattr(response, 'tool_calls'):
-                tools_attr = response.tool_calls
-                logger.info(f"Found 'tool_calls' attribute with {len(tools_attr) if tools_attr else 0} items")
-            elif hasattr(response, 'run_response') and hasattr(response.run_response, 'tools'):
-                tools_attr = response.run_response.tools
-                logger.info(f"Found 'run_response.tools' attribute with {len(tools_attr) if tools_attr else 0} items")
-            
-            if tools_attr:
-                logger.info(f"Checking {len(tools_attr)} tool results for elicitation")
-                for idx, tool_result in enumerate(tools_attr):
-                    logger.info(f"Tool result {idx}: type={type(tool_result)}, attrs={dir(tool_result)}")
-                    
-                    # Try to get the result from different possible attributes
-                    result = None
-                    if hasattr(tool_result, 'result'):
-                        result = tool_result.result
-                    elif hasattr(tool_result, 'output'):
-                        result = tool_result.output
-                    elif isinstance(tool_result, dict):
-                        result = tool_result
-                    
-                    if result:
-                        logger.info(f"Tool result {idx} data type: {type(result)}")
-                        logger.info(f"Tool result {idx} data (first 200 chars): {str(result)[:200]}")
-                        
-                        # Parse the result - it might be wrapped in MCP format or be a direct dict
-                        parsed_result = None
-                        
-                        # First, if result is a string, try to evaluate it as a Python literal (dict/list)
-                        if isinstance(result, str):
-                            # Try parsing as JSON first
-                            try:
-                                result = json.loads(result)
-                                logger.info(f"Parsed result from JSON string to: {type(result)}")
-                            except (json.JSONDecodeError, TypeError):
-                                # Try evaluating as Python literal (for string repr of dict)
-                                try:
-                                    import ast
-                                    result = ast.literal_eval(result)
-                                    logger.info(f"Evaluated result from Python literal to: {type(result)}")
-                                except (ValueError, SyntaxError):
-                                    logger.debug(f"Could not parse string as JSON or Python literal: {result[:100]}")
-                        
-                        # Now handle dict results
-                        if isinstance(result, dict):
-                            # Check if it's wrapped in MCP content format
-                            if 'content' in result and isinstance(result['content'], list):
-                                # Extract text from first content item
-                                for content_item in result['content']:
-                                    if isinstance(content_item, dict) and content_item.get('type') == 'text':
-                                        text_value = content_item.get('text', '')
-                                        # Try to parse as JSON
-                                        try:
-                                            parsed_result = json.loads(text_value)
-                                            logger.info(f"✅ Parsed JSON from MCP content.text: {type(parsed_result)}")
-                                            break
-                                        except (json.JSONDecodeError, TypeError):
-                                            logger.debug(f"Could not parse text as JSON: {text_value[:100]}")
-                            else:
-                                # Direct dict, use as-is
-                                parsed_result = result
-                                logger.info(f"Using result dict as-is")
-                        
-                        # Check if the parsed result is an elicitation response
-                        if isinstance(parsed_result, dict) and parsed_result.get('elicitation_id'):
-                            logger.info(f"✅ Found elicitation in tool result: {parsed_result.get('elicitation_id')}")
-                            elicitation_response = parsed_result
-                            
-                            # CRITICAL: Store elicitation state in Redis
-                            # This was missing - the orchestrator must save elicitation to Redis
-                            # so it can be retrieved when user responds
-                            try:
-                                from schemas.elicitation import ElicitationSchema
-                                elicitation_manager = get_elicitation_manager()
-                                
-                                schema_dict = elicitation_response.get('schema', {})
-                                elicitation_schema = ElicitationSchema(**schema_dict)
-                                
-                                elicitation_manager.create_elicitation(
-                                    tool_call_id=elicitation_response.get('tool_call_id', ''),
-                                    mcp_endpoint='initiate_payment',
-                                    user_id=self.user_id,
-                                    session_id=self.session_id,
-                                    room_name=self.session_id,  # Using session_id as room_name
-                                    schema=elicitation_schema,
-                                    suspended_tool_arguments=elicitation_response.get('suspended_arguments', {}),
-                                    timeout_seconds=schema_dict.get('timeout_seconds', 300)
-                                )
-                                logger.info(f"✅ Saved elicitation {elicitation_response.get('elicitation_id')} to Redis")
-                            except Exception as e:
-                                logger.error(f"❌ Failed to save elicitation to Redis: {e}", exc_info=True)
-                            
-                            break
+            stream = agno_event_stream(heartbeat)
+            if pii_masking:
+                # Optionally sanitize output (if enabled) one sentence at a time
+                stream = _mask_by_sentence(stream, mask)
+            try:
+                async with contextlib.aclosing(stream):
+                    async for chunk in stream:
+                        await queue.put(chunk)
+            except Exception as e:
+                await queue.put(e)
             else:
-                logger.warning("No tool results found in response")
-            
-            # If there's an elicitation, send it to the UI via data channel
-            if elicitation_response:
-                logger.info(f"Sending elicitation {elicitation_response.get('elicitation_id')} to UI")
-                
-                # Send elicitation to UI via data channel
-                if self.room:
-                    try:
-                        # Wrap the elicitation in the format expected by the frontend
-                        # Frontend expects: { type: "elicitation", elicitation_id, tool_call_id, schema }
-                        message = {
-                            "type": "elicitation",
-                            "elicitation_id": elicitation_response.get('elicitation_id'),
-                            "tool_call_id": elicitation_response.get('tool_call_id'),
-                            "schema": elicitation_response.get('schema', {}),
-                        }
-                        elicitation_json = json.dumps(message)
-                        elicitation_bytes = elicitation_json.encode('utf-8')
-                        await self.room.local_participant.publish_data(elicitation_bytes)
-                        logger.info(f"Successfully sent elicitation {elicitation_response.get('elicitation_id')} to UI with type='elicitation'")
-                    except Exception as e:
-                        logger.error(f"Failed to send elicitation to UI: {e}")
+                await queue.put(_STREAM_END)
+        
+        async def agno_response_stream():
+            queue: asyncio.Queue = asyncio.Queue(maxsize=_AGNO_STREAM_QUEUE_SIZE)
+            producer = asyncio.create_task(produce_chunks(queue))
+            started = False
+            try:
+                while True:
+                    if started:
+                        chunk = await queue.get()
+                    else:
+                        # Don't leave the user in silence if Agno hangs before its first
+                        # output; each tool call event restarts the wait
+                        chunk = await asyncio.wait_for(queue.get(), _AGNO_FIRST_CHUNK_TIMEOUT)
+                    if chunk is _STREAM_HEARTBEAT:
+                        continue
+                    if chunk is _STREAM_END:
+                        break
+                    if isinstance(chunk, Exception):
+                        raise chunk
+                    started = True
+                    yield chunk
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    logger.error(f"Agno made no progress within {_AGNO_FIRST_CHUNK_TIMEOUT}s")
                 else:
-                    logger.warning("Room not available, cannot send elicitation to UI")
-                
-                # Return a voice response telling user to check their device
-                response_text = "I've sent a payment confirmation request to your device. Please review the details and enter the OTP code to complete the transaction."
+                    logger.error(f"Error in Agno LLM node: {e}")
+                if not started:
+                    # Fallback to default LLM if Agno failed before saying anything
+                    producer.cancel()
+                    async for chunk in fallback_llm_node(chat_ctx, tools, model_settings):
+                        yield chunk
+            finally:
+                # Stop the Agno run if the reply was interrupted
+                if not producer.done():
+                    producer.cancel()
+        
+        # Return the stream
+        return agno_response_stream()
+    
+    def _find_elicitation(self, tool_result: Any) -> Optional[dict]:
+        """Return the elicitation payload if this tool result requests one, else None."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Tool result: type=%s, attrs=%s", type(tool_result), dir(tool_result))
+        
+        # Try to get the result from different possible attributes
+        result = None
+        if hasattr(tool_result, 'result'):
+            result = tool_result.result
+        elif hasattr(tool_result, 'output'):
+            result = tool_result.output
+        elif isinstance(tool_result, dict):
+            result = tool_result
+        
+        if not result:
+            return None
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Tool result data type: %s", type(result))
+            logger.debug("Tool result data (first 200 chars): %s", str(result)[:200])
+        
+        # Parse the result - it might be wrapped in MCP format or be a direct dict
+        parsed_result = None
+        
+        # Dict results need no parsing; string results are JSON (see agno_tools._call_tool)
+        if isinstance(result, (str, bytes, bytearray)):
+            try:
+                result = fast_json.loads(result)
+            except (fast_json.JSONDecodeError, TypeError):
+                logger.debug(f"Could not parse tool result as JSON: {result[:100]}")
+                return None
+        
+        # Now handle dict results
+        if isinstance(result, dict):
+            # Check if it's wrapped in MCP content format
+            if 'content' in result and isinstance(result['content'], list):
+                # Extract text from first content item
+                for content_item in result['content']:
+                    if isinstance(content_item, dict) and content_item.get('type') == 'text':
+                        text_value = content_item.get('text', '')
+                        # Try to parse as JSON
+                        try:
+                            parsed_result = fast_json.loads(text_value)
+                            logger.debug("Parsed JSON from MCP content.text: %s", type(parsed_result))
+                            break
+                        except (fast_json.JSONDecodeError, TypeError):
+                            logger.debug(f"Could not parse text as JSON: {text_value[:100]}")
             else:
-                # Convert Agno response to LiveKit streaming format
-                # Agno returns a RunResponse object with content
-                response_text = response.content if hasattr(response, 'content') else str(response)
-            
-            # Stream the response back as async generator
-            async def agno_response_stream():
-                # Yield response in chunks to simulate streaming
-                chunk_size = 50
-                for i in range(0, len(response_text), chunk_size):
-                    chunk = response_text[i:i + chunk_size]
-                    # Optionally sanitize output before streaming (if enabled)
-                    sanitized_chunk = sanitize_text(chunk)
-                    yield sanitized_chunk
-            
-            # Return the stream
-            return agno_response_stream()
+                # Direct dict, use as-is
+                parsed_result = result
+                logger.debug("Using result dict as-is")
+        
+        # Check if the parsed result is an elicitation response
+        if isinstance(parsed_result, dict) and parsed_result.get('elicitation_id'):
+            logger.info(f"✅ Found elicitation in tool result: {parsed_result.get('elicitation_id')}")
+            return parsed_result
+        return None
+    
+    async def _save_elicitation(self, elicitation_response: dict):
+        """Store the elicitation in Redis without blocking the event loop."""
+        # CRITICAL: Store elicitation state in Redis
+        # This was missing - the orchestrator must save elicitation to Redis
+        # so it can be retrieved when user responds
+        try:
+            schema_dict = elicitation_response.get('schema', {})
+            elicitation_schema = ElicitationSchema.model_validate(schema_dict)
             
+            # The first use connects to Redis, so resolve the manager off the event loop too
+            manager = _elicitation_manager or await asyncio.to_thread(_get_elicitation_manager)
+            await manager.create_elicitation_async(
+                tool_call_id=elicitation_response.get('tool_call_id', ''),
+                mcp_endpoint='initiate_payment',
+                user_id=self.user_id,
+                session_id=self.session_id,
+                room_name=self.session_id,  # Using session_id as room_name
+                schema=elicitation_schema,
+                suspended_tool_arguments=elicitation_response.get('suspended_arguments', {}),
+                timeout_seconds=schema_dict.get('timeout_seconds', 300)
+            )
+            logger.info(f"✅ Saved elicitation {elicitation_response.get('elicitation_id')} to Redis")
         except Exception as e:
-            logger.error(f"Error in Agno LLM node: {e}")
-            # Fallback to default on error
-            return super().llm_node(chat_ctx, tools, model_settings)
+            logger.error(f"❌ Failed to save elicitation to Redis: {e}", exc_info=True)
+    
+    async def _publish_elicitation(self, elicitation_response: dict):
+        """Send the elicitation to the UI via data channel."""
+        logger.info(f"Sending elicitation {elicitation_response.get('elicitation_id')} to UI")
+        
+        # Send elicitation to UI via data channel
+        if self.room:
+            try:
+                # Wrap the elicitation in the format expected by the frontend
+                # Frontend expects: { type: "elicitation", elicitation_id, tool_call_id, schema }
+                message = {
+                    "type": "elicitation",
+                    "elicitation_id": elicitation_response.get('elicitation_id'),
+                    "tool_call_id": elicitation_response.get('tool_call_id'),
+                    "schema": elicitation_response.get('schema', {}),
+                }
+                # Stays on the reliable channel: a dropped packet would leave the user
+                # without the OTP form. Only the caller needs it, so skip other participants.
+                await self.room.local_participant.publish_data(
+                    fast_json.dumps(message),
+                    reliable=True,
+                    destination_identities=[self.participant_identity] if self.participant_identity else [],
+                )
+                logger.info(f"Successfully sent elicitation {elicitation_response.get('elicitation_id')} to UI with type='elicitation'")
+            except Exception as e:
+                logger.error(f"Failed to send elicitation to UI: {e}")
+        else:
+            logger.warning("Room not available, cannot send elicitation to UI")
     
     def tts_node(self, text: AsyncIterable[str], model_settings: ModelSettings):
         """
         Intercepts LLM Output -> TTS.
         Optionally sanitizes the stream before the agent speaks it (if enabled).
         """
+        if not self._pii_masking:
+            # Nothing to sanitize: hand the stream straight to TTS without buffering
+            return super().tts_node(text, model_settings)
         
-        # We define a generator to wrap the incoming text stream
-        async def safe_text_stream():
-            async for chunk in text:
-                # Note: Running Presidio on small chunks (tokens) is inaccurate.
-                # Ideally, you should buffer by sentence. 
-                # For this sample, we assume 'chunk' is substantial or we accept partial redaction risks.
-                # LiveKit's LLM stream usually yields chunks; a buffer might be needed for production accuracy.
-                sanitized_chunk = sanitize_text(chunk)
-                yield sanitized_chunk
-
-        # Pass the safe stream to the original TTS node logic
-        return super().tts_node(safe_text_stream(), model_settings)
+        # Pass the sanitized stream to the original TTS node logic
+        return super().tts_node(_mask_by_sentence(text, self._mask), model_settings)
         
 
+def prewarm(proc: JobProcess):
+    """
+    Runs once per worker process before it accepts jobs.
+    Loads heavyweight resources so they are not on the critical path of a room join.
+    """
+    proc.userdata["vad"] = silero.VAD.load()
+    
+    # Presidio/spaCy model loading (only when PII masking uses Presidio)
+    pii_masking.warm_up()
+    
+    # agent.py imports the Agno/gateway/elicitation stack lazily so the main worker
+    # process stays small; load it here so the first job doesn't pay for the imports
+    import agno.agent  # noqa: F401
+    import ai_gateway  # noqa: F401
+    import agno_redis_storage  # noqa: F401
+    import agno_tools  # noqa: F401
+    import elicitation_cleanup  # noqa: F401
+    import elicitation_manager  # noqa: F401
+    import elicitation_response_handler  # noqa: F401
+
+
+def _prefetch_backends():
+    """Create the Redis-backed clients (blocking; run off the event loop)."""
+    for name, factory in (
+        ("session manager", get_session_manager),
+        ("elicitation manager", _get_elicitation_manager),
+        ("Agno storage", _get_db),
+    ):
+        try:
+            factory()
+        except Exception as e:
+            # Retried (and surfaced) by the first real use
+            logger.error(f"Failed to initialize {name}: {e}")
+
+
+def _log_task_failure(action: str, task: asyncio.Task):
+    """Done-callback for background tasks whose failures should only be logged."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Failed to {action}: {task.exception()}")
+
+
 async def entrypoint(ctx: agents.JobContext):
     """
     Entrypoint for LiveKit voice agent.
@@ -567,38 +913,44 @@ async def entrypoint(ctx: agents.JobContext):
     await ctx.connect(auto_subscribe=AutoSubscribe.AUDIO_ONLY)
     logger.info(f"Connected to room {room_name}")
 
+    # The Redis-backed managers and Agno storage connect on first use; set them up in
+    # a worker thread while waiting for the participant
+    prefetch_task = asyncio.create_task(asyncio.to_thread(_prefetch_backends))
+
     logger.info(f"Waiting for participant to join room {room_name}...")
     participant = await ctx.wait_for_participant()
     logger.info(f"Participant joined: {participant.identity}, metadata: {participant.metadata}")
 
     # Check this specific participant (no need to loop over all if we waited for one)
-    if participant:
-        if participant.metadata:
+    # Metadata is either a JSON object or a (Bearer) JWT; check for a JWT first so
+    # JWT metadata does not go through a failed JSON parse.
+    # isinstance check: metadata is not a string (MagicMock) in console mode
+    raw_metadata = participant.metadata if participant else None
+    if raw_metadata and isinstance(raw_metadata, str):
+        # One match detects the JWT and strips the Bearer prefix/whitespace
+        jwt_match = _JWT_METADATA_RE.match(raw_metadata)
+        if jwt_match:
             try:
-                # Check if metadata is a string (not a MagicMock in console mode)
-                if isinstance(participant.metadata, str):
-                    metadata = json.loads(participant.metadata)
-                    user_id = metadata.get("user_id")
-                    email = metadata.get("email")
-                    roles = metadata.get("roles", ["customer"])
-                    permissions = metadata.get("permissions", ["read"])
-                    # Determine platform from metadata or participant name
-                    platform = metadata.get("platform", "web")
-            except (json.JSONDecodeError, AttributeError, TypeError) as e:
-                # If JSON parsing fails, check if it's a JWT token string
-                if isinstance(participant.metadata, str) and (participant.metadata.startswith("eyJ") or "Bearer " in participant.metadata):
-                    try:
-                        # Clean up token if needed
-                        token = participant.metadata.replace("Bearer ", "").strip()
-                        # Decode without verification to extract claims
-                        claims = jwt.get_unverified_claims(token)
-                        
-                        user_id = claims.get("user_id") or claims.get("sub")
-                        email = claims.get("email")
-                        roles = claims.get("roles", ["customer"])
-                        permissions = claims.get("permissions", ["read"])
-                    except Exception:
-                        pass
+                # Decode without verification to extract claims
+                claims = _get_unverified_jwt_claims(jwt_match.group(1))
+                
+                user_id = claims.get("user_id") or claims.get("sub")
+                email = claims.get("email")
+                roles = claims.get("roles", ["customer"])
+                permissions = claims.get("permissions", ["read"])
+            except Exception:
+                pass
+        else:
+            try:
+                metadata = fast_json.loads(raw_metadata)
+                user_id = metadata.get("user_id")
+                email = metadata.get("email")
+                roles = metadata.get("roles", ["customer"])
+                permissions = metadata.get("permissions", ["read"])
+                # Determine platform from metadata or participant name
+                platform = metadata.get("platform", "web")
+            except (fast_json.JSONDecodeError, AttributeError, TypeError):
+                pass
 
     # If no metadata found, try to extract from participant identity
     # Fallback: use participant identity if it follows the pattern voice_assistant_user_{user_id}
@@ -612,24 +964,28 @@ async def entrypoint(ctx: agents.JobContext):
 
     # Final fallback: use environment variable or default for console mode
     if not user_id:
-        user_id = os.getenv("DEFAULT_USER_ID", "12345")
+        user_id = _DEFAULT_USER_ID
         email = f"user_{user_id}@example.com"
         logger.info(f"Using default user_id from environment: {user_id}")
 
-    # Initialize session in Redis if user_id is available
-    session_manager = get_session_manager()
+    # Initialize session in Redis if user_id is available. Nothing below reads it back
+    # before the first reply, so the write runs in the background.
+    await prefetch_task
     if user_id:
-        try:
-            session_manager.create_session(
-                user_id=user_id,
-                email=email or f"user_{user_id}@example.com",
-                roles=roles if isinstance(roles, list) else [roles],
-                permissions=permissions if isinstance(permissions, list) else [permissions],
-                room_name=room_name,
-                platform=platform,
-            )
-        except Exception:
-            pass
+        session_task = asyncio.create_task(asyncio.to_thread(
+            get_session_manager().create_session,
+            user_id=user_id,
+            email=email or f"user_{user_id}@example.com",
+            roles=roles if isinstance(roles, list) else [roles],
+            permissions=permissions if isinstance(permissions, list) else [permissions],
+            room_name=room_name,
+            platform=platform,
+        ))
+        session_task.add_done_callback(functools.partial(_log_task_failure, "create session in Redis"))
+
+    # Session updates made during the call are batched; write any still queued at shutdown
+    session_writes = SessionWriteBehind(get_session_manager())
+    ctx.add_shutdown_callback(session_writes.flush)
 
     # Create agent instance
     assistant = Assistant()
@@ -642,164 +998,205 @@ async def entrypoint(ctx: agents.JobContext):
     
     # Store room reference for data channel access (elicitations)
     assistant.room = room
+    if isinstance(participant.identity, str):
+        assistant.participant_identity = participant.identity
+    
+    # Drop the cached Agno agent once this job ends
+    async def _evict_agno_agent():
+        evict_agno_agent(assistant.user_id, assistant.session_id)
+    
+    ctx.add_shutdown_callback(_evict_agno_agent)
+    
+    # Close the shared gateway connection pool; cached models hold a reference to it
+    async def _close_gateway_client():
+        from ai_gateway import close_gateway_http_client
+        _get_model.cache_clear()
+        await close_gateway_http_client()
+    
+    ctx.add_shutdown_callback(_close_gateway_client)
+    # Same for the MCP server connections (reopened on demand by a later job)
+    ctx.add_shutdown_callback(close_mcp_client)
     logger.info(f"Set agent context: user_id={user_id}, email={assistant.email}, session_id={room_name}")
+    
+    # Build the Agno agent while the session starts up
+    assistant.start_agno_initialization()
 
     # Create agent session
     # Note: Using VAD (Voice Activity Detection) for turn detection instead of MultilingualModel
     # VAD handles voice activity without requiring model downloads
     # Get model ID for LiveKit session (fallback to default if not set)
     # Note: LiveKit uses a different format, but we'll use the same model ID
-    livekit_model_id = os.getenv("AI_MODEL_ID", "gpt-4.1-mini")
+    livekit_model_id = _AI_MODEL_ID
     
     agent_session = AgentSession(
         stt="assemblyai/universal-streaming:en",
         llm=f"openai/{livekit_model_id}",
         tts="cartesia/sonic-3:a167e0f3-df7e-4d52-a9c3-f949145efdab",  # Male voice
-        vad=silero.VAD.load(),
+        vad=ctx.proc.userdata["vad"],
         # turn_detection removed - VAD handles voice activity detection without model downloads
     )
 
     # Initialize elicitation handler
-    elicitation_manager = get_elicitation_manager()
+    from elicitation_cleanup import start_cleanup_task, stop_cleanup_task
+    from elicitation_response_handler import get_response_handler
+    
+    _get_elicitation_manager()
     response_handler = get_response_handler()
     
+    # Expire unanswered elicitations (and prune the expiry index) while the job runs
+    await start_cleanup_task()
+    ctx.add_shutdown_callback(stop_cleanup_task)
+    
+    # Elicitation responses are processed one at a time by a single consumer task,
+    # so a burst of data channel messages cannot pile up concurrent Redis/MCP calls
+    elicitation_queue: asyncio.Queue = asyncio.Queue(maxsize=_ELICITATION_QUEUE_SIZE)
+    
+    async def handle_elicitation_response(payload: dict, sender_identity: Optional[str]):
+        """Confirm an elicitation response and narrate the outcome to the user."""
+        elicitation_id, user_input, biometric_token = map(payload.get, _ELICITATION_RESPONSE_FIELDS)
+        
+        try:
+            result = await response_handler.handle_response(
+                elicitation_id=elicitation_id,
+                user_input=user_input,
+                biometric_token=biometric_token
+            )
+
+            # Send result back to the client that answered. The UI only acts on the
+            # spoken confirmation that follows, so this ack can go over the lossy channel.
+            await room.local_participant.publish_data(
+                fast_json.dumps(result),
+                reliable=False,
+                destination_identities=[sender_identity] if sender_identity else [],
+            )
+
+            # If successful, narrate confirmation to user
+            if result.get('status') == 'completed':
+                payment_result = result.get('payment_result', {})
+                confirmation = payment_result.get('confirmation_number', 'Unknown')
+                amount = payment_result.get('amount', 0)
+                from_account = payment_result.get('from_account', 'your account')
+                to_account = payment_result.get('to_account', 'the recipient')
+
+                # Format amount nicely
+                amount_str = f"${amount:.2f}" if isinstance(amount, (int, float)) else str(amount)
+                fallback_message = _PAYMENT_CONFIRMED_SHORT_MESSAGE.format(
+                    amount=amount_str, confirmation=confirmation
+                )
+
+                logger.info(
+                    f"✅ Payment completed: {amount_str} from {from_account} to {to_account}, "
+                    f"confirmation: {confirmation}"
+                )
+
+                # Update session state with payment completion, in the background
+                # while the spoken confirmation is generated
+                if assistant.user_id and assistant.session_id:
+                    # Store payment completion in session
+                    session_writes.schedule(
+                        assistant.session_id,
+                        assistant.user_id,
+                        {
+                            "last_payment_confirmation": confirmation,
+                            "last_payment_amount": amount_str,
+                            "last_payment_from": from_account,
+                            "last_payment_to": to_account,
+                            "last_payment_completed_at": datetime.utcnow().isoformat()
+                        }
+                    )
+
+                # Generate voice response by simulating a user message
+                # This is more reliable than using generate_reply with instructions
+                if assistant.agno_agent:
+                    try:
+                        logger.debug("Processing payment completion notification...")
+
+                        # Create a user message that simulates the user confirming the payment
+                        # This will go through the normal llm_node flow and generate a natural response
+                        user_confirmation_message = _PAYMENT_CONFIRMED_USER_MESSAGE.format(
+                            amount=amount_str,
+                            from_account=from_account,
+                            to_account=to_account,
+                            confirmation=confirmation,
+                        )
+
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(
+                                "Simulating user message to trigger agent response: %s...",
+                                user_confirmation_message[:100],
+                            )
+
+                        # Use generate_reply with user_input to simulate a user message
+                        # This will go through llm_node normally and trigger TTS
+                        await agent_session.generate_reply(
+                            user_input=user_confirmation_message
+                        )
+
+                        logger.debug("Voice response generated for payment completion")
+
+                    except Exception as e:
+                        logger.error(f"Error processing payment completion: {e}", exc_info=True, stack_info=True)
+                        # Fallback: try with a simpler message
+                        try:
+                            logger.info("Attempting fallback voice response...")
+                            await agent_session.generate_reply(
+                                user_input=fallback_message
+                            )
+                            logger.debug("Fallback voice response generated")
+                        except Exception as fallback_error:
+                            logger.error(f"Fallback generate_reply also failed: {fallback_error}", exc_info=True, stack_info=True)
+                            # Last resort: log the error but don't crash
+                            logger.error("Could not generate voice response for payment completion")
+                else:
+                    logger.warning("Agno agent not initialized, using fallback notification")
+                    await agent_session.generate_reply(
+                        user_input=fallback_message
+                    )
+            else:
+                error = result.get('error', 'Unknown error')
+
+                # Reply straight away. The turn goes through llm_node, so when Agno is
+                # active it answers the user and records the failure in its session
+                # history in the same run; a separate memory-update run is not needed.
+                await agent_session.generate_reply(
+                    user_input=_PAYMENT_FAILED_USER_MESSAGE.format(error=error)
+                )
+
+        except Exception as e:
+            logger.error(f"[Elicitation] Error handling response: {e}", exc_info=True)
+
+    async def elicitation_consumer():
+        while True:
+            payload, sender_identity = await elicitation_queue.get()
+            try:
+                await handle_elicitation_response(payload, sender_identity)
+            finally:
+                elicitation_queue.task_done()
+    
+    elicitation_consumer_task = asyncio.create_task(elicitation_consumer())
+    
+    async def _stop_elicitation_consumer():
+        elicitation_consumer_task.cancel()
+    
+    ctx.add_shutdown_callback(_stop_elicitation_consumer)
+    
     # Setup data channel listener for elicitation responses
     @room.on("data_received")
     def on_data_received(data_packet):
         """Handle data channel messages from client (elicitation responses)."""
         try:
             # Decode the data
-            payload_bytes = bytes(data_packet.data)
-            payload_str = payload_bytes.decode('utf-8')
-            payload = json.loads(payload_str)
+            payload = fast_json.loads(data_packet.data)
             
             # Handle elicitation response
-            if payload.get("type") == "elicitation_response":
-                elicitation_id = payload.get("elicitation_id")
-                user_input = payload.get("user_input")
-                biometric_token = payload.get("biometric_token")
-                
-                # Handle response asynchronously
-                async def handle_async():
-                    try:
-                        result = await response_handler.handle_response(
-                            elicitation_id=elicitation_id,
-                            user_input=user_input,
-                            biometric_token=biometric_token
-                        )
-                        
-                        # Send result back to client
-                        result_json = json.dumps(result)
-                        result_bytes = result_json.encode('utf-8')
-                        await room.local_participant.publish_data(result_bytes)
-                        
-                        # If successful, narrate confirmation to user
-                        if result.get('status') == 'completed':
-                            payment_result = result.get('payment_result', {})
-                            confirmation = payment_result.get('confirmation_number', 'Unknown')
-                            amount = payment_result.get('amount', 0)
-                            from_account = payment_result.get('from_account', 'your account')
-                            to_account = payment_result.get('to_account', 'the recipient')
-                            
-                            # Format amount nicely
-                            amount_str = f"${amount:.2f}" if isinstance(amount, (int, float)) else str(amount)
-                            
-                            logger.info(
-                                f"✅ Payment completed: {amount_str} from {from_account} to {to_account}, "
-                                f"confirmation: {confirmation}"
-                            )
-                            
-                            # Update session state with payment completion
-                            try:
-                                session_manager = get_session_manager()
-                                if assistant.user_id and assistant.session_id:
-                                    # Store payment completion in session
-                                    session_manager.update_session(
-                                        assistant.session_id,
-                                        assistant.user_id,
-                                        {
-                                            "last_payment_confirmation": confirmation,
-                                            "last_payment_amount": amount_str,
-                                            "last_payment_from": from_account,
-                                            "last_payment_to": to_account,
-                                            "last_payment_completed_at": datetime.utcnow().isoformat()
-                                        }
-                                    )
-                                    logger.info(f"Updated session state with payment completion: {confirmation}")
-                            except Exception as e:
-                                logger.error(f"Error updating session state: {e}", exc_info=True)
-                            
-                            # Generate voice response by simulating a user message
-                            # This is more reliable than using generate_reply with instructions
-                            if assistant.agno_agent:
-                                try:
-                                    logger.info("Processing payment completion notification...")
-                                    
-                                    # Create a user message that simulates the user confirming the payment
-                                    # This will go through the normal llm_node flow and generate a natural response
-                                    user_confirmation_message = (
-                                        f"I've confirmed the payment of {amount_str} from {from_account} "
-                                        f"to {to_account}. The confirmation number is {confirmation}."
-                                    )
-                                    
-                                    logger.info(f"Simulating user message to trigger agent response: {user_confirmation_message[:100]}...")
-                                    
-                                    # Use generate_reply with user_input to simulate a user message
-                                    # This will go through llm_node normally and trigger TTS
-                                    await agent_session.generate_reply(
-                                        user_input=user_confirmation_message
-                                    )
-                                    
-                                    logger.info("Voice response generated for payment completion")
-                                    
-                                except Exception as e:
-                                    logger.error(f"Error processing payment completion: {e}", exc_info=True, stack_info=True)
-                                    # Fallback: try with a simpler message
-                                    try:
-                                        logger.info("Attempting fallback voice response...")
-                                        fallback_message = (
-                                            f"Payment of {amount_str} confirmed. Confirmation number {confirmation}."
-                                        )
-                                        await agent_session.generate_reply(
-                                            user_input=fallback_message
-                                        )
-                                        logger.info("Fallback voice response generated")
-                                    except Exception as fallback_error:
-                                        logger.error(f"Fallback generate_reply also failed: {fallback_error}", exc_info=True, stack_info=True)
-                                        # Last resort: log the error but don't crash
-                                        logger.error("Could not generate voice response for payment completion")
-                            else:
-                                logger.warning("Agno agent not initialized, using fallback notification")
-                                await agent_session.generate_reply(
-                                    user_input=(
-                                        f"Payment of {amount_str} confirmed. Confirmation number {confirmation}."
-                                    )
-                                )
-                        else:
-                            error = result.get('error', 'Unknown error')
-                            
-                            # Add error to Agno agent's memory
-                            if assistant.agno_agent:
-                                try:
-                                    await assistant.agno_agent.arun(
-                                        f"SYSTEM UPDATE: The payment confirmation failed with error: {error}. Inform the user and offer to help retry."
-                                    )
-                                except Exception as e:
-                                    logger.error(f"Error updating Agno agent memory: {e}")
-                                    await agent_session.generate_reply(
-                                        user_input=f"Payment confirmation failed: {error}"
-                                    )
-                            else:
-                                await agent_session.generate_reply(
-                                    user_input=f"Payment confirmation failed: {error}"
-                                )
-                            
-                    except Exception as e:
-                        logger.error(f"[Elicitation] Error handling response: {e}", exc_info=True)
-                
-                # Schedule the async handler
-                import asyncio
-                asyncio.create_task(handle_async())
+            if payload.get("type") == _ELICITATION_RESPONSE_TYPE:
+                try:
+                    sender = data_packet.participant
+                    elicitation_queue.put_nowait((payload, sender.identity if sender else None))
+                except asyncio.QueueFull:
+                    logger.warning(
+                        f"[Elicitation] Queue full, dropping response for {payload.get('elicitation_id')}"
+                    )
                 
         except Exception as e:
             logger.error(f"[DataChannel] Error processing data: {e}", exc_info=True)
@@ -819,4 +1216,4 @@ async def entrypoint(ctx: agents.JobContext):
 
 if __name__ == "__main__":
     # Run the agent
-    agents.cli.run_app(agents.WorkerOptions(entrypoint_fnc=entrypoint))
+    agents.cli.run_app(agents.WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=prewarm))
@@ -7,7 +7,9 @@ This enables the agent to remember previous conversations across the session.
 
 import os
 import logging
+import threading
 from typing import Optional
+import redis
 from dotenv import load_dotenv
 from agno.db.redis import RedisDb
 
@@ -15,6 +17,9 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on Redis connections shared by every session's Agno storage in this worker
+_REDIS_MAX_CONNECTIONS = 32
+
 
 class AgnoRedisStorage:
     """Wrapper for Agno Redis storage configuration."""
@@ -26,16 +31,27 @@ class AgnoRedisStorage:
         redis_password = os.getenv("REDIS_PASSWORD")
         redis_db = int(os.getenv("REDIS_DB", "0"))
         
-        # Build Redis URL
-        if redis_password:
-            redis_url = f"redis://:{redis_password}@{redis_host}:{redis_port}/{redis_db}"
-        else:
-            redis_url = f"redis://{redis_host}:{redis_port}/{redis_db}"
-        
         try:
-            # RedisDb only accepts db_url parameter
+            # Agno serializes sessions with its own JSON helpers and its key scans
+            # expect str responses, so the client must keep decode_responses=True;
+            # a binary codec such as msgpack cannot be plugged into RedisDb.
+            # Building the client here (instead of handing RedisDb a URL) skips
+            # URL assembly/parsing and keeps the password out of a connection string.
+            # A bounded, blocking pool caps open sockets when many rooms persist runs at
+            # once; keepalive and health checks keep idle pooled connections usable.
+            pool = redis.BlockingConnectionPool(
+                host=redis_host,
+                port=redis_port,
+                password=redis_password,
+                db=redis_db,
+                decode_responses=True,
+                max_connections=_REDIS_MAX_CONNECTIONS,
+                socket_keepalive=True,
+                health_check_interval=30,
+            )
+            redis_client = redis.Redis(connection_pool=pool)
             self.db = RedisDb(
-                db_url=redis_url,
+                redis_client=redis_client,
             )
             logger.info(f"Initialized Agno Redis storage at {redis_host}:{redis_port}/{redis_db}")
         except Exception as e:
@@ -50,13 +66,17 @@ class AgnoRedisStorage:
 
 # Singleton instance
 _agno_storage_instance: Optional[AgnoRedisStorage] = None
+_agno_storage_lock = threading.Lock()
 
 
 def get_agno_storage() -> AgnoRedisStorage:
     """Get or create the Agno Redis storage singleton."""
     global _agno_storage_instance
     if _agno_storage_instance is None:
-        _agno_storage_instance = AgnoRedisStorage()
+        # Built from worker threads too (see agent._prefetch_backends)
+        with _agno_storage_lock:
+            if _agno_storage_instance is None:
+                _agno_storage_instance = AgnoRedisStorage()
     return _agno_storage_instance
 
 
@@ -7,13 +7,252 @@ Agno's MCPTools discovery (which requires connection and may fail).
 """
 
 import os
+import json
+import time
+import functools
+import types
+import asyncio
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Literal, Mapping, Sequence
 from agno.tools.function import Function
 from mcp_client import get_mcp_client
+from elicitation_manager import get_elicitation_manager
+
+__all__ = ["AuthenticatedMCPTools", "TOOL_GROUPS", "create_agno_mcp_tools"]
 
 logger = logging.getLogger(__name__)
 
+_NO_ARGUMENTS: Mapping[str, Any] = types.MappingProxyType({})
+
+# Static tool catalogue: (name, description, takes parameters, group)
+# Built once at import; each AuthenticatedMCPTools only binds these to its own user/session.
+# Groups let a session register only the tools its persona needs, which keeps the tool
+# schemas sent with every model call (and so input tokens) down.
+_TOOL_DEFINITIONS = (
+    (
+        "get_balance",
+        "Get account balances for the authenticated user. Optionally filter by account type (checking, savings, credit_card). Returns list of accounts with balances.",
+        True,
+        "read",
+    ),
+    (
+        "get_transactions",
+        "Get transaction history for the authenticated user with pagination. Can filter by account_type (checking, savings, credit_card), account_id (UUID - optional, defaults to savings account if not provided), start_date (YYYY-MM-DD), end_date (YYYY-MM-DD), limit (default: 10, max: 100), and offset (default: 0) for pagination. Returns list of transactions sorted by date (most recent first).",
+        True,
+        "read",
+    ),
+    (
+        "get_loans",
+        "Get loan information for the authenticated user including balance, interest rate, monthly payment, and remaining term. Returns list of loans.",
+        False,
+        "read",
+    ),
+    (
+        "get_credit_limit",
+        "Get credit card limits and available credit for the authenticated user. Returns credit limit information.",
+        False,
+        "read",
+    ),
+    (
+        "get_current_date_time",
+        "Get the current date and time. Returns formatted date/time string.",
+        False,
+        "meta",
+    ),
+    (
+        "get_user_details",
+        "Get user profile details including email, name, roles, and permissions. Returns user information dictionary.",
+        False,
+        "read",
+    ),
+    (
+        "get_transfer_contacts",
+        "Get list of saved contacts/beneficiaries for transfers. Useful for resolving names like 'Pay Bob' to actual payment details. Returns list of beneficiary dictionaries with nickname and payment information.",
+        False,
+        "payments",
+    ),
+    (
+        "initiate_payment",
+        "Initiate a payment or transfer funds. Triggers elicitation flow requiring user confirmation via OTP. CRITICAL: to_account MUST be the recipient's UPI ID or account number (e.g., 'john@okicici.com'), NOT their name. ALWAYS call get_transfer_contacts first to resolve names to payment addresses. REQUIRED: from_account (source account type: 'checking' or 'savings'), to_account (UPI ID/account number from contact's paymentAddress field), amount (number). OPTIONAL: description. Returns elicitation request with payment session details.",
+        True,
+        "payments",
+    ),
+    (
+        "confirm_payment",
+        "Confirm a payment using OTP code. This completes a payment that was previously initiated with initiate_payment. REQUIRED: payment_session_id (from initiate_payment), otp_code (6-digit OTP sent to user). Returns payment confirmation with transaction details.",
+        True,
+        "payments",
+    ),
+    (
+        "create_reminder",
+        "Create a payment reminder. REQUIRED: scheduled_date (ISO 8601 format, e.g., '2025-12-20T10:00:00Z'), amount (number), recipient (string), account_id (UUID string). OPTIONAL: description (string), beneficiary_id (UUID string). Returns reminder confirmation with reminder details.",
+        True,
+        "reminders",
+    ),
+    (
+        "get_reminders",
+        "Get payment reminders for the authenticated user. OPTIONAL filters: is_completed (string: 'true' or 'false'), scheduled_date_from (ISO 8601), scheduled_date_to (ISO 8601). Returns list of payment reminders.",
+        True,
+        "reminders",
+    ),
+    (
+        "update_reminder",
+        "Update an existing payment reminder. REQUIRED: reminder_id (UUID string). OPTIONAL: scheduled_date (ISO 8601), amount (string), recipient (string), description (string), account_id (UUID string). Returns updated reminder details.",
+        True,
+        "reminders",
+    ),
+    (
+        "delete_reminder",
+        "Delete a payment reminder. REQUIRED: reminder_id (UUID string). Returns deletion confirmation.",
+        True,
+        "reminders",
+    ),
+)
+
+
+# Scope mapping for JWT generation (read-only, shared by every session)
+_SCOPE_MAP = types.MappingProxyType({
+    "get_balance": ("read",),
+    "get_transactions": ("read",),
+    "get_loans": ("read",),
+    "get_credit_limit": ("read",),
+    "get_current_date_time": ("read",),
+    "get_user_details": ("read",),  # Get user profile information
+    "get_transfer_contacts": ("read",),  # Get beneficiaries/contacts
+    "initiate_payment": ("transact",),  # Initiate payment with elicitation
+    "confirm_payment": ("transact",),  # Confirm payment with OTP
+    "create_reminder": ("configure",),  # Create payment reminder
+    "get_reminders": ("read",),  # Get payment reminders
+    "update_reminder": ("configure",),  # Update payment reminder
+    "delete_reminder": ("configure",),  # Delete payment reminder
+})
+# Scopes for tools missing from _SCOPE_MAP
+_DEFAULT_SCOPES = ("read",)
+
+# Seconds a read result may be reused within a session; the model often re-asks for
+# these while reconsidering a turn. Balances, transactions and reminders change with
+# the user's own actions and are never cached.
+_READ_CACHE_TTL_SECONDS = types.MappingProxyType({
+    "get_user_details": 300,
+    "get_transfer_contacts": 60,
+    "get_loans": 60,
+    "get_credit_limit": 30,
+    "get_current_date_time": 5,
+})
+
+# Circuit breaker: this many failures of one tool within the window pause it for the
+# cool-down, so a degraded MCP server is not hammered by model retries
+_BREAKER_FAILURE_THRESHOLD = 3
+_BREAKER_WINDOW_SECONDS = 30.0
+_BREAKER_COOLDOWN_SECONDS = 15.0
+
+
+class _InflightCancelled(Exception):
+    """Set on a shared in-flight read whose owning task was cancelled."""
+
+
+# Tools batch_read may call
+_READ_TOOLS = frozenset(name for name, scopes in _SCOPE_MAP.items() if scopes == _DEFAULT_SCOPES)
+
+TOOL_GROUPS = frozenset(definition[3] for definition in _TOOL_DEFINITIONS)
+
+# Parameterless read tools; in compact mode these are offered to the model as actions of
+# one banking_read tool instead of one schema each, shrinking the tool definitions sent
+# with every model call
+_COMPACT_READ_TOOLS = frozenset(
+    name for name, _, takes_params, _ in _TOOL_DEFINITIONS
+    if name in _READ_TOOLS and not takes_params
+)
+
+
+def _batch_read_description(read_tools: List[str]) -> str:
+    """Describe batch_read for the read-only tools registered alongside it."""
+    return (
+        "Call several read-only tools at once instead of one after another. Use it when "
+        f"a request needs more than one of: {', '.join(read_tools)}. "
+        "REQUIRED: calls (list of objects like {\"name\": \"get_balance\", \"args\": {\"account_type\": \"savings\"}}; "
+        "args is optional). Returns a list with one {name, result} or {name, error} entry per call, in order."
+    )
+
+
+def _template_function(stub, name: str, description: str, strict: bool = False) -> Function:
+    """
+    Infer a tool's JSON schema once from a stand-in callable with its signature.
+    Sessions copy the template and only bind their own entrypoint.
+    """
+    stub.__name__ = name
+    stub.__doc__ = description
+    function = Function.from_callable(stub, name=name, strict=strict)
+    function.description = description
+    # The schema is final; stop Agno re-deriving it from the entrypoint on every run
+    function.skip_entrypoint_processing = True
+    return function
+
+
+def _tool_stub(takes_params: bool):
+    """Stand-in with the signature of an MCP tool wrapper."""
+    if takes_params:
+        async def stub(**kwargs: Any) -> Any: ...
+    else:
+        async def stub() -> Any: ...
+    return stub
+
+
+async def _batch_read_stub(calls: List[Dict[str, Any]]) -> str: ...
+
+
+# Zero-argument tools are strict: an empty, closed schema with nothing to coerce
+_TEMPLATE_FUNCTIONS = types.MappingProxyType({
+    name: _template_function(_tool_stub(takes_params), name, description, strict=not takes_params)
+    for name, description, takes_params, _ in _TOOL_DEFINITIONS
+})
+_BATCH_READ_TEMPLATE = _template_function(
+    _batch_read_stub, "batch_read", _batch_read_description(sorted(_READ_TOOLS))
+)
+
+
+# Longest an await_elicitation call holds the turn waiting for the user to confirm
+_AWAIT_ELICITATION_TIMEOUT_SECONDS = 15.0
+# How often await_elicitation re-reads an elicitation that is not stored yet (it is
+# saved in the background after the tool that started it returns)
+_AWAIT_ELICITATION_POLL_SECONDS = 0.25
+
+_AWAIT_ELICITATION_DESCRIPTION = (
+    "Wait for a payment confirmation (elicitation) to finish. initiate_payment returns at once "
+    "with an elicitation_id while the user confirms with their OTP; tell the user what is "
+    "happening first, and call this only when you need the final outcome. REQUIRED: "
+    "elicitation_id. Returns {elicitation_id, status}; status is completed, failed, expired or "
+    "cancelled, or still pending/processing if the user has not finished yet."
+)
+
+
+async def _await_elicitation_stub(elicitation_id: str) -> str: ...
+
+
+_AWAIT_ELICITATION_TEMPLATE = _template_function(
+    _await_elicitation_stub, "await_elicitation", _AWAIT_ELICITATION_DESCRIPTION, strict=True
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _banking_read_template(actions: tuple) -> Function:
+    """Template for banking_read over the given actions (its enum depends on them)."""
+    async def stub(action: Literal[actions]) -> str: ...
+    
+    description = (
+        "Look up read-only banking information. REQUIRED: action, one of: "
+        f"{', '.join(actions)}. Returns that tool's result."
+    )
+    function = _template_function(stub, "banking_read", description)
+    # Agno's schema inference has no Literal support; spell out the enum
+    function.parameters = {
+        "type": "object",
+        "properties": {"action": {"type": "string", "enum": list(actions)}},
+        "required": ["action"],
+        "additionalProperties": False,
+    }
+    return function
+
 
 class AuthenticatedMCPTools:
     """
@@ -22,7 +261,19 @@ class AuthenticatedMCPTools:
     Uses Function.from_callable() to convert async functions into Agno Function objects.
     """
     
-    def __init__(self, user_id: str, session_id: str, email: Optional[str] = None, mcp_url: Optional[str] = None):
+    # Shared by every instance; tool scopes do not depend on the user
+    scope_map = _SCOPE_MAP
+    
+    def __init__(
+        self,
+        user_id: str,
+        session_id: str,
+        email: Optional[str] = None,
+        mcp_url: Optional[str] = None,
+        groups: Optional[Iterable[str]] = None,
+        compact_reads: bool = False,
+        await_elicitation: bool = False,
+    ):
         """
         Initialize authenticated MCP tools.
         
@@ -31,48 +282,129 @@ class AuthenticatedMCPTools:
             session_id: Session/room identifier for JWT generation
             email: User email address for JWT generation (optional but recommended)
             mcp_url: MCP server URL (defaults to env var, kept for compatibility)
+            groups: Default tool groups for get_tools() (see TOOL_GROUPS; None means all)
+            compact_reads: Default for get_tools(compact_reads=...)
+            await_elicitation: Register the await_elicitation tool with the payments
+                group. Leave off when the caller narrates payment outcomes itself (the
+                voice agent does, from the elicitation response), or the outcome would
+                be reported twice
         """
         self.user_id = user_id
         self.session_id = session_id
         self.email = email
+        self.groups = groups
+        self.compact_reads = compact_reads
+        self.await_elicitation = await_elicitation
         self.mcp_client = get_mcp_client()
         
-        # Scope mapping for JWT generation
-        self.scope_map = {
-            "get_balance": ["read"],
-            "get_transactions": ["read"],
-            "get_loans": ["read"],
-            "get_credit_limit": ["read"],
-            "get_current_date_time": ["read"],
-            "get_user_details": ["read"],  # Get user profile information
-            "get_transfer_contacts": ["read"],  # Get beneficiaries/contacts
-            "initiate_payment": ["transact"],  # Initiate payment with elicitation
-            "confirm_payment": ["transact"],  # Confirm payment with OTP
-            "create_reminder": ["configure"],  # Create payment reminder
-            "get_reminders": ["read"],  # Get payment reminders
-            "update_reminder": ["configure"],  # Update payment reminder
-            "delete_reminder": ["configure"],  # Delete payment reminder
-        }
+        # Agno Function objects per (groups, compact_reads), built on first get_tools() call
+        self._tools: Dict[tuple, List[Function]] = {}
+        
+        # (tool_name, sorted params) -> (result, monotonic time it stops being reused)
+        self._read_cache: Dict[tuple, tuple] = {}
+        # Bumped by every write so a read that overlapped it is not cached
+        self._write_generation = 0
+        # (tool_name, sorted params) -> future of the identical read in progress
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        # Circuit breaker: tool_name -> (failures in the window, window start)
+        # and tool_name -> monotonic time calls are allowed again
+        self._failures: Dict[str, tuple] = {}
+        self._breaker_open_until: Dict[str, float] = {}
     
-    async def _call_tool(self, tool_name: str, **kwargs) -> Any:
+    async def _call_mcp(self, tool_name: str, arguments: Mapping[str, Any] = _NO_ARGUMENTS) -> Any:
         """
         Call MCP tool via HTTP with JWT authentication.
         
+        Reads are served from the short TTL cache when possible, and identical reads
+        already in flight are shared instead of sent twice. A tool that keeps failing
+        is short-circuited for a cool-down period.
+        
         Args:
             tool_name: Name of the tool to call
-            **kwargs: Tool parameters
+            arguments: Tool parameters (passed through to MCP without re-packing)
             
         Returns:
             Tool response
         """
-        logger.info(f"🔧 MCP Tool called: {tool_name} with params: {kwargs}")
-        
         # Get required scope for this tool
-        scopes = self.scope_map.get(tool_name, ["read"])
+        scopes = self.scope_map.get(tool_name, _DEFAULT_SCOPES)
+        is_write = scopes != _DEFAULT_SCOPES
         
-        # Remove jwt_token if present (we'll add our own)
-        kwargs.pop("jwt_token", None)
+        read_key = None
+        if not is_write:
+            try:
+                read_key = (tool_name, tuple(sorted(arguments.items())))
+                hash(read_key)
+            except TypeError:
+                # Unhashable or unorderable params; no caching or coalescing
+                read_key = None
         
+        ttl = _READ_CACHE_TTL_SECONDS.get(tool_name, 0)
+        if ttl and read_key is not None:
+            cached = self._read_cache.get(read_key)
+            if cached is not None and cached[1] > time.monotonic():
+                logger.debug("MCP Tool %s served from cache", tool_name)
+                return cached[0]
+        
+        open_until = self._breaker_open_until.get(tool_name)
+        if open_until is not None and open_until > time.monotonic():
+            raise ValueError(f"{tool_name} is temporarily unavailable after repeated failures")
+        
+        if read_key is None:
+            return await self._fetch(tool_name, arguments, scopes, is_write, None, 0)
+        
+        # Single flight: a duplicate read (e.g. a model retry) awaits the call in progress.
+        # shield() keeps one cancelled waiter from cancelling the shared call.
+        inflight = self._inflight.get(read_key)
+        if inflight is not None:
+            logger.debug("MCP Tool %s joined an in-flight call", tool_name)
+            try:
+                return await asyncio.shield(inflight)
+            except _InflightCancelled:
+                # The task that owned the call was cancelled (e.g. an interrupted
+                # turn); this waiter was not, so it makes the call itself
+                return await self._call_mcp(tool_name, arguments)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[read_key] = future
+        try:
+            result = await self._fetch(tool_name, arguments, scopes, is_write, read_key, ttl)
+        except asyncio.CancelledError:
+            # Don't pass the owner's cancellation on to waiters; they retry instead
+            future.set_exception(_InflightCancelled())
+            future.exception()  # Mark retrieved in case nobody was waiting
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved; the caller below re-raises it
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._inflight.get(read_key) is future:
+                del self._inflight[read_key]
+    
+    async def _fetch(
+        self,
+        tool_name: str,
+        arguments: Mapping[str, Any],
+        scopes: Sequence[str],
+        is_write: bool,
+        cache_key: Optional[tuple],
+        ttl: float,
+    ) -> Any:
+        """Send one MCP call, keeping the read cache and circuit breaker up to date."""
+        if is_write:
+            # Payments and reminder changes can make any cached read stale
+            self._write_generation += 1
+            self._read_cache.clear()
+        generation = self._write_generation
+        
+        # Lazy %-style args: the params repr is only built when INFO is enabled
+        logger.info("🔧 MCP Tool called: %s with params: %s", tool_name, arguments)
+        
+        # mcp_client drops any jwt_token passed in (it adds its own) and empty values
         # Call via MCP client which handles JWT generation and HTTP calls
         try:
             result = await self.mcp_client._call_mcp_tool(
@@ -81,132 +413,213 @@ class AuthenticatedMCPTools:
                 self.session_id,
                 scopes,
                 email=self.email,
-                **kwargs
+                arguments=arguments,
             )
-            logger.info(f"✅ MCP Tool {tool_name} succeeded")
+            logger.info("✅ MCP Tool %s succeeded", tool_name)
+            self._failures.pop(tool_name, None)
+            self._breaker_open_until.pop(tool_name, None)
+            if ttl and cache_key is not None and generation == self._write_generation:
+                self._read_cache[cache_key] = (result, time.monotonic() + ttl)
             return result
         except Exception as e:
-            logger.error(f"❌ MCP Tool {tool_name} failed: {e}")
+            logger.error("❌ MCP Tool %s failed: %s", tool_name, e)
+            self._record_failure(tool_name)
             raise
+        finally:
+            if is_write:
+                self._write_generation += 1
+                self._read_cache.clear()
+    
+    def _record_failure(self, tool_name: str):
+        """Count a failure and open the breaker after too many in a short window."""
+        now = time.monotonic()
+        count, window_start = self._failures.get(tool_name, (0, now))
+        if now - window_start > _BREAKER_WINDOW_SECONDS:
+            count, window_start = 0, now
+        count += 1
+        if count >= _BREAKER_FAILURE_THRESHOLD:
+            logger.warning(
+                "MCP Tool %s failed %d times within %ss; pausing it for %ss",
+                tool_name, count, _BREAKER_WINDOW_SECONDS, _BREAKER_COOLDOWN_SECONDS,
+            )
+            self._breaker_open_until[tool_name] = now + _BREAKER_COOLDOWN_SECONDS
+            count, window_start = 0, now
+        self._failures[tool_name] = (count, window_start)
+    
+    async def _call_tool(self, tool_name: str, **kwargs) -> str:
+        """Call an MCP tool on behalf of Agno and return its result as JSON text."""
+        # Agno stringifies tool results with str(); return JSON text so both the model
+        # and the elicitation check in llm_node get parseable JSON, not a Python repr
+        return json.dumps(await self._call_mcp(tool_name, kwargs))
+    
+    async def _batch_read(self, calls: List[Dict[str, Any]], allowed: frozenset = _READ_TOOLS) -> str:
+        """
+        Run several read-scope tools concurrently, so a turn needing e.g. balances,
+        transactions and reminders waits for the slowest call instead of all of them.
+        
+        Args:
+            calls: [{"name": tool_name, "args": {...}}, ...]; only read-scope tools are allowed
+            allowed: Read tools the caller registered (defaults to all of them)
+            
+        Returns:
+            JSON list with one {"name", "result"} or {"name", "error"} entry per call, in order
+        """
+        async def run_one(call: Any) -> Dict[str, Any]:
+            name = call.get("name") if isinstance(call, dict) else None
+            if not isinstance(name, str) or name not in allowed:
+                return {"name": name, "error": "batch_read only accepts read-only tools"}
+            args = call.get("args") or {}
+            if not isinstance(args, dict):
+                return {"name": name, "error": "args must be an object"}
+            try:
+                return {"name": name, "result": await self._call_mcp(name, args)}
+            except Exception as e:
+                return {"name": name, "error": str(e)}
+        
+        results = await asyncio.gather(*(run_one(call) for call in calls or []))
+        return json.dumps(results)
     
-    def get_tools(self) -> List[Function]:
+    async def _await_elicitation(self, elicitation_id: str) -> str:
         """
-        Get list of Agno Function objects for all available MCP tools.
+        Wait (bounded) for an elicitation to resolve and report its status.
+        
+        Args:
+            elicitation_id: ID returned by the tool that started the elicitation
+            
+        Returns:
+            JSON {"elicitation_id", "status"} or {"elicitation_id", "error"}
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + _AWAIT_ELICITATION_TIMEOUT_SECONDS
+        try:
+            manager = await asyncio.to_thread(get_elicitation_manager)
+            while True:
+                status = await manager.wait_for_resolution(
+                    elicitation_id, max(0.0, deadline - loop.time())
+                )
+                # Not found may only mean the background save has not landed yet
+                if status is not None or deadline - loop.time() <= _AWAIT_ELICITATION_POLL_SECONDS:
+                    break
+                await asyncio.sleep(_AWAIT_ELICITATION_POLL_SECONDS)
+        except Exception as e:
+            logger.error("❌ Waiting for elicitation %s failed: %s", elicitation_id, e)
+            return json.dumps({"elicitation_id": elicitation_id, "error": str(e)})
+        if status is None:
+            return json.dumps({"elicitation_id": elicitation_id, "error": "unknown elicitation"})
+        return json.dumps({"elicitation_id": elicitation_id, "status": status.value})
+    
+    def get_tools(
+        self, groups: Optional[Iterable[str]] = None, compact_reads: Optional[bool] = None
+    ) -> List[Function]:
+        """
+        Get list of Agno Function objects for the available MCP tools.
         These functions will call our _call_tool method which uses HTTP with JWT.
+        Built on first call for each group selection and reused afterwards.
+        
+        Args:
+            groups: Tool groups to include (see TOOL_GROUPS); defaults to the groups
+                given at construction, or all tools if none were given
+            compact_reads: Offer the parameterless read tools as actions of a single
+                banking_read tool; defaults to the value given at construction
         
         Returns:
             List of Function objects that can be used by AgnoAgent
         """
+        if groups is None:
+            groups = self.groups
+        if compact_reads is None:
+            compact_reads = self.compact_reads
+        selected = frozenset(groups) if groups is not None else None
+        tools = self._tools.get((selected, compact_reads))
+        if tools is not None:
+            return tools
+        
+        if selected is not None and not selected <= TOOL_GROUPS:
+            logger.warning(f"Ignoring unknown tool groups: {sorted(selected - TOOL_GROUPS)}")
+        
         tools = []
+        read_tools = []
+        compact_actions = []
+        
+        # Function objects are copied from the import-time templates
+        for name, description, takes_params, group in _TOOL_DEFINITIONS:
+            if selected is not None and group not in selected:
+                continue
+            if name in _READ_TOOLS:
+                read_tools.append(name)
+            if compact_reads and name in _COMPACT_READ_TOOLS:
+                compact_actions.append(name)
+                continue
+            # Copy the prebuilt schema and bind this session's entrypoint
+            function = _TEMPLATE_FUNCTIONS[name].model_copy(deep=True)
+            function.entrypoint = self._make_tool_func(name, description, takes_params)
+            tools.append(function)
         
-        # Define all available tools with descriptions and parameter types
-        tool_definitions = [
-            {
-                "name": "get_balance",
-                "description": "Get account balances for the authenticated user. Optionally filter by account type (checking, savings, credit_card). Returns list of accounts with balances.",
-                "func": self._create_tool_func_with_params("get_balance"),
-            },
-            {
-                "name": "get_transactions",
-                "description": "Get transaction history for the authenticated user with pagination. Can filter by account_type (checking, savings, credit_card), account_id (UUID - optional, defaults to savings account if not provided), start_date (YYYY-MM-DD), end_date (YYYY-MM-DD), limit (default: 10, max: 100), and offset (default: 0) for pagination. Returns list of transactions sorted by date (most recent first).",
-                "func": self._create_tool_func_with_params("get_transactions"),
-            },
-            {
-                "name": "get_loans",
-                "description": "Get loan information for the authenticated user including balance, interest rate, monthly payment, and remaining term. Returns list of loans.",
-                "func": self._create_tool_func_no_params("get_loans"),
-            },
-            {
-                "name": "get_credit_limit",
-                "description": "Get credit card limits and available credit for the authenticated user. Returns credit limit information.",
-                "func": self._create_tool_func_no_params("get_credit_limit"),
-            },
-            {
-                "name": "get_current_date_time",
-                "description": "Get the current date and time. Returns formatted date/time string.",
-                "func": self._create_tool_func_no_params("get_current_date_time"),
-            },
-            {
-                "name": "get_user_details",
-                "description": "Get user profile details including email, name, roles, and permissions. Returns user information dictionary.",
-                "func": self._create_tool_func_no_params("get_user_details"),
-            },
-            {
-                "name": "get_transfer_contacts",
-                "description": "Get list of saved contacts/beneficiaries for transfers. Useful for resolving names like 'Pay Bob' to actual payment details. Returns list of beneficiary dictionaries with nickname and payment information.",
-                "func": self._create_tool_func_no_params("get_transfer_contacts"),
-            },
-            {
-                "name": "initiate_payment",
-                "description": "Initiate a payment or transfer funds. Triggers elicitation flow requiring user confirmation via OTP. CRITICAL: to_account MUST be the recipient's UPI ID or account number (e.g., 'john@okicici.com'), NOT their name. ALWAYS call get_transfer_contacts first to resolve names to payment addresses. REQUIRED: from_account (source account type: 'checking' or 'savings'), to_account (UPI ID/account number from contact's paymentAddress field), amount (number). OPTIONAL: description. Returns elicitation request with payment session details.",
-                "func": self._create_tool_func_with_params("initiate_payment"),
-            },
-            {
-                "name": "confirm_payment",
-                "description": "Confirm a payment using OTP code. This completes a payment that was previously initiated with initiate_payment. REQUIRED: payment_session_id (from initiate_payment), otp_code (6-digit OTP sent to user). Returns payment confirmation with transaction details.",
-                "func": self._create_tool_func_with_params("confirm_payment"),
-            },
-            {
-                "name": "create_reminder",
-                "description": "Create a payment reminder. REQUIRED: scheduled_date (ISO 8601 format, e.g., '2025-12-20T10:00:00Z'), amount (number), recipient (string), account_id (UUID string). OPTIONAL: description (string), beneficiary_id (UUID string). Returns reminder confirmation with reminder details.",
-                "func": self._create_tool_func_with_params("create_reminder"),
-            },
-            {
-                "name": "get_reminders",
-                "description": "Get payment reminders for the authenticated user. OPTIONAL filters: is_completed (string: 'true' or 'false'), scheduled_date_from (ISO 8601), scheduled_date_to (ISO 8601). Returns list of payment reminders.",
-                "func": self._create_tool_func_with_params("get_reminders"),
-            },
-            {
-                "name": "update_reminder",
-                "description": "Update an existing payment reminder. REQUIRED: reminder_id (UUID string). OPTIONAL: scheduled_date (ISO 8601), amount (string), recipient (string), description (string), account_id (UUID string). Returns updated reminder details.",
-                "func": self._create_tool_func_with_params("update_reminder"),
-            },
-            {
-                "name": "delete_reminder",
-                "description": "Delete a payment reminder. REQUIRED: reminder_id (UUID string). Returns deletion confirmation.",
-                "func": self._create_tool_func_with_params("delete_reminder"),
-            },
-        ]
-        
-        # Create Function objects for Agno using Function.from_callable()
-        for tool_def in tool_definitions:
-            # Create a properly named function for Agno to introspect
-            tool_func = tool_def["func"]
-            tool_func.__name__ = tool_def["name"]
-            tool_func.__doc__ = tool_def["description"]
+        if compact_actions:
+            tools.append(self._make_banking_read(compact_actions))
+        
+        # Composite tool so independent reads can be issued as one concurrent batch;
+        # it may only call the read tools registered with it
+        if len(read_tools) > 1:
+            allowed = frozenset(read_tools)
+            
+            async def batch_read(calls: List[Dict[str, Any]]) -> str:
+                return await self._batch_read(calls, allowed)
             
-            # Use Function.from_callable() to create Function object
-            # This automatically infers JSON schema from function signature
-            function = Function.from_callable(tool_func, name=tool_def["name"], strict=False)
-            function.description = tool_def["description"]
+            function = _BATCH_READ_TEMPLATE.model_copy(deep=True)
+            function.description = _batch_read_description(read_tools)
+            function.entrypoint = batch_read
+            tools.append(function)
+        
+        # Second phase of a payment: wait for the user's confirmation when needed
+        if self.await_elicitation and (selected is None or "payments" in selected):
+            function = _AWAIT_ELICITATION_TEMPLATE.model_copy(deep=True)
+            function.entrypoint = self._await_elicitation
             tools.append(function)
         
         logger.info(f"Created {len(tools)} MCP tools for Agno agent")
+        self._tools[(selected, compact_reads)] = tools
         return tools
     
-    def _create_tool_func_no_params(self, tool_name: str):
-        """
-        Create an async function for tools that take no parameters.
-        """
-        async def tool_func() -> Any:
-            """Tool function that calls MCP server via HTTP with JWT."""
-            return await self._call_tool(tool_name)
+    def _make_banking_read(self, actions: List[str]) -> Function:
+        """Create the banking_read Function dispatching to the given parameterless read tools."""
+        allowed = frozenset(actions)
         
-        return tool_func
+        async def banking_read(action: str) -> str:
+            if action not in allowed:
+                return json.dumps({"error": f"Unknown action {action!r}; use one of: {', '.join(actions)}"})
+            return await self._call_tool(action)
+        
+        function = _banking_read_template(tuple(actions)).model_copy(deep=True)
+        function.entrypoint = banking_read
+        return function
     
-    def _create_tool_func_with_params(self, tool_name: str):
+    async def _dispatch_no_params(self, tool_name: str, **_: Any) -> str:
+        """Entrypoint for parameterless tools; stray arguments from the model are ignored."""
+        return await self._call_tool(tool_name)
+    
+    def _make_tool_func(self, tool_name: str, description: str, takes_params: bool):
         """
-        Create an async function for tools that accept parameters.
-        Uses **kwargs to accept any parameters that will be passed to MCP.
+        Create the session-bound entrypoint for one MCP tool.
+        Tools with parameters pass their arguments through to MCP; the others take
+        none, matching their template's empty parameter schema. A partial over one
+        shared dispatch method avoids building a closure per tool and session.
         """
-        async def tool_func(**kwargs: Any) -> Any:
-            """Tool function that calls MCP server via HTTP with JWT."""
-            return await self._call_tool(tool_name, **kwargs)
-        
+        dispatch = self._call_tool if takes_params else self._dispatch_no_params
+        tool_func = functools.partial(dispatch, tool_name)
+        tool_func.__name__ = tool_name
+        tool_func.__doc__ = description
         return tool_func
 
 
-def create_agno_mcp_tools(user_id: str, session_id: str):
+def create_agno_mcp_tools(
+    user_id: str,
+    session_id: str,
+    email: Optional[str] = None,
+    groups: Optional[Iterable[str]] = None,
+    compact_reads: bool = False,
+    await_elicitation: bool = False,
+):
     """
     Create MCP tools wrapper for Agno.
     
@@ -214,8 +627,18 @@ def create_agno_mcp_tools(user_id: str, session_id: str):
         user_id: User identifier
         session_id: Session/room identifier
         email: User email address (optional but recommended)
+        groups: Tool groups to register (see TOOL_GROUPS; None means all)
+        compact_reads: Offer parameterless read tools through one banking_read tool
+        await_elicitation: Register the await_elicitation tool (see AuthenticatedMCPTools)
         
     Returns:
         AuthenticatedMCPTools instance
     """
-    return AuthenticatedMCPTools(user_id, session_id)
+    return AuthenticatedMCPTools(
+        user_id,
+        session_id,
+        email=email,
+        groups=groups,
+        compact_reads=compact_reads,
+        await_elicitation=await_elicitation,
+    )
@@ -4,25 +4,84 @@ AI Gateway module for secure model routing and authentication.
 
 import os
 import uuid
+from typing import Optional
+
+import httpx
 from agno.models.openai import OpenAILike
+from dotenv import load_dotenv
+
+load_dotenv()
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+# Voice turns are often more than httpx's default 5s keep-alive apart, which would
+# mean a fresh TCP/TLS handshake to the gateway on most turns. Keep idle connections
+# open for longer and share one pool across every AIGateway instance in the process.
+# With h2 installed, turns are multiplexed over HTTP/2 instead of opening parallel connections.
+_GATEWAY_KEEPALIVE_EXPIRY = 120.0
+_http_client: Optional[httpx.AsyncClient] = None
+
+# Gateway settings, read once at import (see reload_config)
+_ENDPOINT = os.getenv("AI_GATEWAY_ENDPOINT")
+_API_KEY = os.getenv("AI_GATEWAY_API_KEY")
+_API_VERSION_QUERY = {"api-version": "2024-10-21"}
+# Hardcoded constant UUID used when no valid agent_id is supplied
+_DEFAULT_AGENT_ID = "550e8400-e29b-41d4-a716-446655440000"
+
+
+def reload_config() -> None:
+    """Re-read the gateway endpoint and API key from the environment."""
+    global _ENDPOINT, _API_KEY
+    _ENDPOINT = os.getenv("AI_GATEWAY_ENDPOINT")
+    _API_KEY = os.getenv("AI_GATEWAY_API_KEY")
+
+
+def get_gateway_http_client() -> httpx.AsyncClient:
+    """Get the process-wide HTTP client used for AI Gateway requests."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=100,
+                keepalive_expiry=_GATEWAY_KEEPALIVE_EXPIRY,
+            ),
+            http2=_HTTP2_AVAILABLE,
+        )
+    return _http_client
+
+
+async def close_gateway_http_client():
+    """Close the shared AI Gateway HTTP client (e.g. on job shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
 
 
 class AIGateway(OpenAILike):
     """
     AI Gateway connector for secure model access.
     
-    Reads configuration from environment variables:
+    Reads configuration from environment variables (once, at import):
     - AI_GATEWAY_ENDPOINT
     - AI_GATEWAY_API_KEY
     """
     
-    def __init__(self, model_id: str, agent_id: str = None):
+    def __init__(self, model_id: str, agent_id: str = None, prompt_cache_key: Optional[str] = None):
         """
         Initialize AI Gateway connection.
         
         Args:
             model_id: Model deployment ID (e.g., "gpt-4.1", "gpt-4.1-mini")
             agent_id: Agent identifier (UUID v4). If not provided, uses hardcoded constant UUID.
+            prompt_cache_key: Identifier of the shared system prompt, sent as x-prompt-cache-key
+                so the gateway can keep requests with the same prefix on the same prompt cache.
             
         Raises:
             ValueError: If configuration is missing or invalid
@@ -32,35 +91,34 @@ class AIGateway(OpenAILike):
         
         # Use hardcoded constant UUID for agent_id
         # This ensures consistent agent identification across all requests
+        valid_agent_id = _DEFAULT_AGENT_ID
         if agent_id:
             try:
                 # Validate if provided UUID is valid
                 uuid.UUID(agent_id, version=4)
                 valid_agent_id = agent_id
             except (ValueError, AttributeError):
-                # Invalid UUID provided, use hardcoded constant
-                valid_agent_id = "550e8400-e29b-41d4-a716-446655440000"  # Hardcoded constant UUID
-        else:
-            # Use hardcoded constant UUID
-            valid_agent_id = "550e8400-e29b-41d4-a716-446655440000"  # Hardcoded constant UUID
-        
-        # Read config from environment
-        endpoint = os.getenv("AI_GATEWAY_ENDPOINT")
-        api_key = os.getenv("AI_GATEWAY_API_KEY")
+                # Invalid UUID provided, keep the hardcoded constant
+                pass
         
-        if not endpoint or not api_key:
+        if not _ENDPOINT or not _API_KEY:
             raise ValueError(
                 "AI Gateway not configured. Set AI_GATEWAY_ENDPOINT and AI_GATEWAY_API_KEY"
             )
         
+        extra_headers = {
+            "x-agent-id": valid_agent_id,
+            "api-key": _API_KEY
+        }
+        if prompt_cache_key:
+            extra_headers["x-prompt-cache-key"] = prompt_cache_key
+        
         # Initialize OpenAI-compatible model
         super().__init__(
             id=model_id,
-            base_url=f"{endpoint}/deployments/{model_id}",
-            extra_query={"api-version": "2024-10-21"},
-            extra_headers={
-                "x-agent-id": valid_agent_id,
-                "api-key": api_key
-            },
+            base_url=f"{_ENDPOINT}/deployments/{model_id}",
+            extra_query=_API_VERSION_QUERY,
+            extra_headers=extra_headers,
+            http_client=get_gateway_http_client(),
         )
 
@@ -1,18 +1,23 @@
 """
 Elicitation Cleanup Background Task
 ====================================
-Periodically checks for expired elicitations and cleans them up.
+Cleans up expired elicitations, waking at the nearest known expiry deadline
+(at most every check interval, to catch elicitations created by other processes).
 """
 
 import asyncio
 import logging
+import time
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Set
 
 from elicitation_manager import get_elicitation_manager, ElicitationStatus
 
 logger = logging.getLogger(__name__)
 
+# Shortest sleep between cleanup passes, so a burst of near deadlines cannot spin the loop
+_MIN_SLEEP_SECONDS = 1.0
+
 
 class ElicitationCleanupTask:
     """Background task to clean up expired elicitations."""
@@ -22,12 +27,18 @@ class ElicitationCleanupTask:
         Initialize cleanup task.
 
         Args:
-            check_interval_seconds: How often to check for expired elicitations
+            check_interval_seconds: Longest wait between checks for expired elicitations
         """
         self.check_interval = check_interval_seconds
         self.manager = get_elicitation_manager()
         self._task: Optional[asyncio.Task] = None
         self._running = False
+        # Set (thread-safely) when the manager schedules a new deadline
+        self._wake_event = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Client notifications in progress; held here so they are not garbage
+        # collected mid-send, and cancelled together with _run on stop()
+        self._notify_tasks: Set[asyncio.Task] = set()
 
     async def start(self):
         """Start the cleanup task."""
@@ -36,6 +47,8 @@ class ElicitationCleanupTask:
             return
 
         self._running = True
+        self._loop = asyncio.get_running_loop()
+        self.manager.add_expiry_listener(self._on_new_expiry)
         self._task = asyncio.create_task(self._run())
         logger.info(
             f"Started elicitation cleanup task (interval: {self.check_interval}s)"
@@ -47,64 +60,94 @@ class ElicitationCleanupTask:
             return
 
         self._running = False
+        self.manager.remove_expiry_listener(self._on_new_expiry)
         if self._task:
             self._task.cancel()
             try:
                 await self._task
             except asyncio.CancelledError:
                 pass
+        for task in self._notify_tasks:
+            task.cancel()
+        await asyncio.gather(*self._notify_tasks, return_exceptions=True)
 
         logger.info("Stopped elicitation cleanup task")
 
+    def _on_new_expiry(self):
+        """Wake the loop so it can re-plan its sleep (called from any thread)."""
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._wake_event.set)
+
+    def _seconds_until_next_check(self) -> float:
+        """Sleep until the nearest known deadline, bounded by the check interval."""
+        next_expiry = self.manager.next_expiry()
+        if next_expiry is None:
+            return self.check_interval
+        return max(_MIN_SLEEP_SECONDS, min(self.check_interval, next_expiry - time.time()))
+
     async def _run(self):
-        """Main cleanup loop."""
+        """Run cleanup passes until stopped, sleeping until the next deadline in between."""
         while self._running:
             try:
                 await self._cleanup_expired()
             except Exception as e:
-                logger.error(f"Error in cleanup task: {e}")
+                logger.error("Error in cleanup task: %s", e)
 
-            # Wait for next check
-            await asyncio.sleep(self.check_interval)
+            # Wait for the next deadline; a newly created elicitation wakes us early
+            # so we can re-plan around a possibly nearer deadline without a scan
+            while self._running:
+                self._wake_event.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._wake_event.wait(), self._seconds_until_next_check()
+                    )
+                except asyncio.TimeoutError:
+                    break
 
     async def _cleanup_expired(self):
         """Find and clean up expired elicitations."""
+        scan_started = time.time()
         try:
             # Find expired elicitations
-            expired_ids = self.manager.find_expired_elicitations()
+            expired_ids = await asyncio.to_thread(self.manager.find_expired_elicitations)
+            # Every deadline before the scan has now been handled
+            self.manager.discard_expiries_before(scan_started)
 
             if not expired_ids:
                 return
 
-            logger.info(f"Found {len(expired_ids)} expired elicitations")
+            logger.info("Found %d expired elicitations", len(expired_ids))
 
-            # Mark each as expired and notify
-            for elicitation_id in expired_ids:
-                try:
-                    # Get state before marking expired
-                    state = self.manager.get_elicitation(elicitation_id)
-                    if not state:
-                        continue
-
-                    # Mark as expired
-                    success = self.manager.mark_expired(elicitation_id)
-                    if success:
-                        logger.info(
-                            f"Marked elicitation {elicitation_id} as expired "
-                            f"(session: {state.session_id})"
-                        )
-
-                        # TODO: Notify client via LiveKit data channel
-                        # This would require access to the LiveKit room/participant
-                        # await self._notify_client_expired(state)
-
-                except Exception as e:
-                    logger.error(
-                        f"Error marking elicitation {elicitation_id} as expired: {e}"
+            # One batched update for every expired elicitation
+            states = await asyncio.to_thread(self.manager.mark_many_expired, expired_ids)
+            if logger.isEnabledFor(logging.INFO):
+                for elicitation_id, state in states.items():
+                    logger.info(
+                        f"Marked elicitation {elicitation_id} as expired "
+                        f"(session: {state.session_id})"
                     )
 
+            # Notifications are independent network calls; run them concurrently in
+            # the background so they do not delay the next pass
+            for state in states.values():
+                task = asyncio.create_task(self._notify_safely(state))
+                self._notify_tasks.add(task)
+                task.add_done_callback(self._notify_tasks.discard)
+
+        except Exception as e:
+            logger.error("Error finding expired elicitations: %s", e)
+
+    async def _notify_safely(self, state):
+        """Notify a client, logging failures instead of leaving them unretrieved."""
+        try:
+            await self._notify_client_expired(state)
         except Exception as e:
-            logger.error(f"Error finding expired elicitations: {e}")
+            logger.error(
+                "Error notifying client of expired elicitation %s: %s",
+                state.elicitation_id,
+                e,
+            )
 
     async def _notify_client_expired(self, state):
         """
@@ -4,20 +4,31 @@ Elicitation Manager for Redis State Management
 Manages elicitation state, queue, and lifecycle in Redis.
 """
 
-import json
+import asyncio
+import calendar
+import heapq
+import threading
+from collections import OrderedDict
+import time
 import uuid
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable, Tuple
 import redis
+from redis.utils import HIREDIS_AVAILABLE
 from dotenv import load_dotenv
 import os
 
+import fast_json
 from schemas.elicitation import (
     ElicitationState,
     ElicitationSchema,
     ElicitationStatus,
     ElicitationContext,
+    ElicitationField,
+    ElicitationType,
+    FieldValidation,
+    PlatformRequirements,
     create_otp_elicitation,
     create_confirmation_elicitation,
 )
@@ -26,6 +37,76 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Statuses after which an elicitation will not change again
+_RESOLVED_STATUSES = frozenset({
+    ElicitationStatus.COMPLETED,
+    ElicitationStatus.EXPIRED,
+    ElicitationStatus.FAILED,
+    ElicitationStatus.CANCELLED,
+})
+
+# Deadlines this far in the past are dropped from the in-process expiry heap when a
+# new one is scheduled, so the heap stays bounded even if no cleanup task runs. A
+# running cleanup task (30s check interval by default) has handled them by then.
+_STALE_DEADLINE_SECONDS = 60.0
+
+# Sorted set of pending elicitation IDs scored by expiry time (epoch seconds)
+_EXPIRY_INDEX_KEY = "elicitation_expiry"
+
+# In-process cache of recently read or created elicitation states. Entries are
+# dropped on every status write from this process; the short TTL bounds drift
+# from writes made by other processes.
+_LOCAL_CACHE_TTL_SECONDS = 5.0
+_LOCAL_CACHE_MAX_ENTRIES = 1024
+
+# Sets the status only if the elicitation hash still exists, and drops the ID
+# from the expiry index when ARGV[2] is "1" (resolved), in one round trip.
+# KEYS: elicitation hash, expiry index. ARGV: status, resolved flag, elicitation ID.
+_UPDATE_STATUS_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'status', ARGV[1])
+if ARGV[2] == '1' then
+    redis.call('ZREM', KEYS[2], ARGV[3])
+end
+return 1
+"""
+
+# Expires each elicitation only if it is still pending when the script runs, so a
+# response finalized since the caller's read is not overwritten. Returns a 0/1 flag
+# per elicitation. KEYS: expiry index, then (hash, session queue) per elicitation.
+# ARGV: pending status, expired status, then the elicitation IDs.
+_EXPIRE_PENDING_LUA = """
+local expired = {}
+for i = 3, #ARGV do
+    local hash_key = KEYS[2 * (i - 2)]
+    local queue_key = KEYS[2 * (i - 2) + 1]
+    if redis.call('HGET', hash_key, 'status') == ARGV[1] then
+        redis.call('HSET', hash_key, 'status', ARGV[2])
+        redis.call('LREM', queue_key, 0, ARGV[i])
+        redis.call('ZREM', KEYS[1], ARGV[i])
+        expired[#expired + 1] = 1
+    else
+        expired[#expired + 1] = 0
+    end
+end
+return expired
+"""
+
+
+def _to_timestamp(dt: datetime) -> int:
+    """Convert a naive UTC datetime to whole unix seconds for storage."""
+    return calendar.timegm(dt.utctimetuple())
+
+
+def _from_timestamp(value: str) -> datetime:
+    """Parse a stored timestamp back to a naive UTC datetime."""
+    if value.isdigit():
+        return datetime.utcfromtimestamp(int(value))
+    # Elicitations stored before timestamps were written as unix seconds
+    return datetime.fromisoformat(value)
+
 
 class ElicitationManager:
     """Manages elicitation state and queue in Redis."""
@@ -48,16 +129,36 @@ class ElicitationManager:
         # Test connection
         try:
             self.redis_client.ping()
-            logger.info("Elicitation manager connected to Redis")
+            logger.info(
+                "Elicitation manager connected to Redis (hiredis parser %s)",
+                "active" if HIREDIS_AVAILABLE else "not installed",
+            )
         except redis.ConnectionError as e:
             logger.error(f"Could not connect to Redis: {e}")
             raise
 
+        self._update_status_script = self.redis_client.register_script(_UPDATE_STATUS_LUA)
+        self._expire_pending_script = self.redis_client.register_script(_EXPIRE_PENDING_LUA)
+
         # Default timeout for elicitations (5 minutes)
         self.default_timeout_seconds = int(
             os.getenv("ELICITATION_TIMEOUT_SECONDS", "300")
         )
 
+        # Expiry deadlines (epoch seconds) of elicitations created by this process,
+        # so the cleanup task can sleep until the nearest one instead of polling.
+        # create_elicitation runs in worker threads, hence the lock (which also
+        # guards the resolution waiters below).
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._local_lock = threading.Lock()
+        self._expiry_listeners: List[Callable[[], None]] = []
+
+        # In-process waiters for an elicitation to resolve: id -> [(loop, event)]
+        self._resolution_waiters: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
+
+        # id -> (cached_at, state), least recently used first; guarded by _local_lock
+        self._local_cache: "OrderedDict[str, Tuple[float, ElicitationState]]" = OrderedDict()
+
     def create_elicitation(
         self,
         tool_call_id: str,
@@ -104,11 +205,12 @@ class ElicitationManager:
             suspended_tool_arguments=suspended_tool_arguments,
         )
 
-        # Store in Redis
-        self._store_elicitation(state, timeout)
+        # Store the hash, queue it and index its expiry in one round trip
+        deadline = time.time() + timeout
+        self._store_and_enqueue(state, timeout, deadline)
+        self._cache_put(state)
 
-        # Add to queue
-        self._add_to_queue(session_id, elicitation_id)
+        self._schedule_expiry(deadline, elicitation_id)
 
         logger.info(
             f"Created elicitation {elicitation_id} for session {session_id}, "
@@ -117,12 +219,65 @@ class ElicitationManager:
 
         return state
 
-    def _store_elicitation(self, state: ElicitationState, ttl_seconds: int):
-        """Store elicitation state in Redis with TTL."""
-        key = f"elicitation:{state.elicitation_id}"
+    async def create_elicitation_async(self, *args, **kwargs) -> ElicitationState:
+        """
+        Async variant of create_elicitation for callers on the event loop.
 
-        # Convert to dict for Redis storage
-        data = {
+        Runs the Redis writes in a worker thread so they never block the loop.
+        Accepts the same arguments as create_elicitation.
+        """
+        return await asyncio.to_thread(self.create_elicitation, *args, **kwargs)
+
+    def _schedule_expiry(self, deadline: float, elicitation_id: str):
+        """Record an expiry deadline and wake anyone waiting on the nearest one."""
+        stale_before = time.time() - _STALE_DEADLINE_SECONDS
+        with self._local_lock:
+            while self._expiry_heap and self._expiry_heap[0][0] < stale_before:
+                heapq.heappop(self._expiry_heap)
+            heapq.heappush(self._expiry_heap, (deadline, elicitation_id))
+            listeners = list(self._expiry_listeners)
+        for listener in listeners:
+            try:
+                listener()
+            except Exception as e:
+                logger.error(f"Error notifying expiry listener: {e}")
+
+    def add_expiry_listener(self, listener: Callable[[], None]):
+        """
+        Register a callback invoked whenever a new expiry deadline is scheduled.
+
+        The callback may run in a worker thread, so it must be thread-safe
+        (e.g. loop.call_soon_threadsafe(event.set)).
+        """
+        with self._local_lock:
+            self._expiry_listeners.append(listener)
+
+    def remove_expiry_listener(self, listener: Callable[[], None]):
+        """Unregister a callback added with add_expiry_listener."""
+        with self._local_lock:
+            if listener in self._expiry_listeners:
+                self._expiry_listeners.remove(listener)
+
+    def next_expiry(self) -> Optional[float]:
+        """
+        Get the earliest scheduled expiry known to this process.
+
+        Returns:
+            Epoch timestamp of the nearest deadline, or None if nothing is scheduled
+        """
+        with self._local_lock:
+            return self._expiry_heap[0][0] if self._expiry_heap else None
+
+    def discard_expiries_before(self, timestamp: float):
+        """Forget deadlines earlier than timestamp (already handled by a cleanup pass)."""
+        with self._local_lock:
+            while self._expiry_heap and self._expiry_heap[0][0] < timestamp:
+                heapq.heappop(self._expiry_heap)
+
+    @staticmethod
+    def _elicitation_hash(state: ElicitationState) -> Dict[str, Any]:
+        """Convert elicitation state to the fields of its Redis hash."""
+        return {
             "elicitation_id": state.elicitation_id,
             "tool_call_id": state.tool_call_id,
             "mcp_endpoint": state.mcp_endpoint,
@@ -130,15 +285,49 @@ class ElicitationManager:
             "session_id": state.session_id,
             "room_name": state.room_name,
             "status": state.status.value,
-            "schema": state.schema.model_dump_json(),
-            "created_at": state.created_at.isoformat(),
-            "expires_at": state.expires_at.isoformat(),
-            "suspended_tool_arguments": json.dumps(state.suspended_tool_arguments),
+            "schema": fast_json.dumps(state.schema.model_dump(mode="json")).decode(),
+            "created_at": _to_timestamp(state.created_at),
+            "expires_at": _to_timestamp(state.expires_at),
+            "suspended_tool_arguments": fast_json.dumps(state.suspended_tool_arguments).decode(),
         }
 
+    def _store_and_enqueue(self, state: ElicitationState, ttl_seconds: int, deadline: float):
+        """
+        Store elicitation state with TTL, add it to its session queue and index its
+        expiry deadline (epoch seconds) in one round trip.
+        """
+        key = f"elicitation:{state.elicitation_id}"
+        queue_key = f"elicitation_queue:{state.session_id}"
+
+        try:
+            with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.hset(key, mapping=self._elicitation_hash(state))
+                pipe.expire(key, ttl_seconds + 60)  # Extra 60s buffer
+                # Add to left of list (FIFO queue when popping from right)
+                pipe.lpush(queue_key, state.elicitation_id)
+                pipe.expire(queue_key, 3600)  # 1 hour
+                pipe.zadd(_EXPIRY_INDEX_KEY, {state.elicitation_id: deadline})
+                # The index has no TTL; drop members whose hash has already expired
+                # (deadline + 60s buffer) in case no cleanup sweep removed them
+                pipe.zremrangebyscore(_EXPIRY_INDEX_KEY, "-inf", time.time() - 60)
+                pipe.execute()
+            logger.debug(
+                f"Stored elicitation {state.elicitation_id} and queued it for session {state.session_id}"
+            )
+        except redis.RedisError as e:
+            logger.error(f"Error storing elicitation: {e}")
+            raise
+
+    def _store_elicitation(self, state: ElicitationState, ttl_seconds: int):
+        """Store elicitation state in Redis with TTL."""
+        key = f"elicitation:{state.elicitation_id}"
+
         try:
-            self.redis_client.hset(key, mapping=data)
-            self.redis_client.expire(key, ttl_seconds + 60)  # Extra 60s buffer
+            # One round trip for the hash and its TTL
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.hset(key, mapping=self._elicitation_hash(state))
+            pipe.expire(key, ttl_seconds + 60)  # Extra 60s buffer
+            pipe.execute()
             logger.debug(f"Stored elicitation {state.elicitation_id} in Redis")
         except redis.RedisError as e:
             logger.error(f"Error storing elicitation: {e}")
@@ -148,12 +337,19 @@ class ElicitationManager:
         """
         Retrieve elicitation state from Redis.
 
+        States created or read by this process in the last few seconds are served
+        from an in-process cache.
+
         Args:
             elicitation_id: Elicitation identifier
 
         Returns:
             ElicitationState or None if not found
         """
+        cached = self._cache_get(elicitation_id)
+        if cached is not None:
+            return cached
+
         key = f"elicitation:{elicitation_id}"
 
         try:
@@ -162,30 +358,88 @@ class ElicitationManager:
                 logger.warning(f"Elicitation {elicitation_id} not found")
                 return None
 
-            # Parse stored data
-            schema_data = json.loads(data["schema"])
-            schema = ElicitationSchema(**schema_data)
-
-            state = ElicitationState(
-                elicitation_id=data["elicitation_id"],
-                tool_call_id=data["tool_call_id"],
-                mcp_endpoint=data["mcp_endpoint"],
-                user_id=data["user_id"],
-                session_id=data["session_id"],
-                room_name=data["room_name"],
-                status=ElicitationStatus(data["status"]),
-                schema=schema,
-                created_at=datetime.fromisoformat(data["created_at"]),
-                expires_at=datetime.fromisoformat(data["expires_at"]),
-                suspended_tool_arguments=json.loads(data["suspended_tool_arguments"]),
-            )
-
+            state = self._parse_elicitation(data)
+            self._cache_put(state)
             return state
 
         except (redis.RedisError, KeyError, ValueError) as e:
             logger.error(f"Error retrieving elicitation {elicitation_id}: {e}")
             return None
 
+    def _cache_get(self, elicitation_id: str) -> Optional[ElicitationState]:
+        """Return a cached state younger than the local TTL, if any."""
+        with self._local_lock:
+            entry = self._local_cache.get(elicitation_id)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > _LOCAL_CACHE_TTL_SECONDS:
+                del self._local_cache[elicitation_id]
+                return None
+            self._local_cache.move_to_end(elicitation_id)
+            return entry[1]
+
+    def _cache_put(self, state: ElicitationState):
+        """Cache a state, evicting the least recently used entry when full."""
+        with self._local_lock:
+            self._local_cache[state.elicitation_id] = (time.monotonic(), state)
+            self._local_cache.move_to_end(state.elicitation_id)
+            if len(self._local_cache) > _LOCAL_CACHE_MAX_ENTRIES:
+                self._local_cache.popitem(last=False)
+
+    def _cache_invalidate(self, *elicitation_ids: str):
+        """Drop cached states after a write."""
+        with self._local_lock:
+            for elicitation_id in elicitation_ids:
+                self._local_cache.pop(elicitation_id, None)
+
+    @staticmethod
+    def _construct_schema(data: Dict[str, Any]) -> ElicitationSchema:
+        """
+        Rebuild an ElicitationSchema from its stored JSON without re-validating it.
+
+        The schema was validated when the elicitation was created, so nested models
+        are built with model_construct; only enums need converting back.
+        """
+        fields = [
+            ElicitationField.model_construct(
+                **{
+                    **field,
+                    "validation": FieldValidation.model_construct(**field.get("validation", {})),
+                }
+            )
+            for field in data["fields"]
+        ]
+        return ElicitationSchema.model_construct(
+            **{
+                **data,
+                "elicitation_type": ElicitationType(data["elicitation_type"]),
+                "fields": fields,
+                "context": ElicitationContext.model_construct(**data["context"]),
+                "platform_requirements": PlatformRequirements.model_construct(
+                    **data.get("platform_requirements", {})
+                ),
+            }
+        )
+
+    @classmethod
+    def _parse_elicitation(cls, data: Dict[str, str]) -> ElicitationState:
+        """Build an ElicitationState from its stored Redis hash, skipping validation."""
+        schema = cls._construct_schema(fast_json.loads(data["schema"]))
+
+        return ElicitationState.model_construct(
+            elicitation_id=data["elicitation_id"],
+            tool_call_id=data["tool_call_id"],
+            mcp_endpoint=data["mcp_endpoint"],
+            user_id=data["user_id"],
+            session_id=data["session_id"],
+            room_name=data["room_name"],
+            status=ElicitationStatus(data["status"]),
+            schema=schema,
+            created_at=_from_timestamp(data["created_at"]),
+            expires_at=_from_timestamp(data["expires_at"]),
+            suspended_tool_arguments=fast_json.loads(data["suspended_tool_arguments"]),
+        )
+
     def update_elicitation_status(
         self, elicitation_id: str, status: ElicitationStatus
     ) -> bool:
@@ -201,20 +455,159 @@ class ElicitationManager:
         """
         key = f"elicitation:{elicitation_id}"
 
+        resolved = status in _RESOLVED_STATUSES
+        self._cache_invalidate(elicitation_id)
+
         try:
-            # Check if exists
-            if not self.redis_client.exists(key):
+            # Existence check, status write and (once resolved) removal from the
+            # expiry index run atomically in one script call
+            updated = self._update_status_script(
+                keys=[key, _EXPIRY_INDEX_KEY],
+                args=[status.value, "1" if resolved else "0", elicitation_id],
+            )
+            if not updated:
                 logger.warning(f"Cannot update non-existent elicitation {elicitation_id}")
                 return False
 
-            self.redis_client.hset(key, "status", status.value)
             logger.info(f"Updated elicitation {elicitation_id} status to {status.value}")
+            if resolved:
+                self._notify_resolved(elicitation_id)
             return True
 
         except redis.RedisError as e:
             logger.error(f"Error updating elicitation status: {e}")
             return False
 
+    def finalize(
+        self, elicitation_id: str, session_id: str, status: ElicitationStatus
+    ) -> bool:
+        """
+        Set a resolved status and drop the elicitation from its session queue and the
+        expiry index in one MULTI/EXEC.
+
+        Unlike update_elicitation_status this skips the EXISTS check; if the hash has
+        already expired, the status field HSET recreated is deleted again.
+
+        Args:
+            elicitation_id: Elicitation identifier
+            session_id: Session the elicitation was queued for
+            status: Final status
+
+        Returns:
+            True if the elicitation existed and was updated, False otherwise
+        """
+        key = f"elicitation:{elicitation_id}"
+        self._cache_invalidate(elicitation_id)
+
+        try:
+            pipe = self.redis_client.pipeline(transaction=True)
+            pipe.hset(key, "status", status.value)
+            pipe.lrem(f"elicitation_queue:{session_id}", 0, elicitation_id)
+            pipe.zrem(_EXPIRY_INDEX_KEY, elicitation_id)
+            added, _, _ = pipe.execute()
+            if added:
+                # The hash was gone; don't leave a status-only hash without a TTL
+                self.redis_client.delete(key)
+                logger.warning(f"Cannot finalize non-existent elicitation {elicitation_id}")
+                return False
+        except redis.RedisError as e:
+            logger.error(f"Error finalizing elicitation: {e}")
+            return False
+
+        logger.info(f"Finalized elicitation {elicitation_id} as {status.value}")
+        if status in _RESOLVED_STATUSES:
+            self._notify_resolved(elicitation_id)
+        return True
+
+    def get_elicitation_status(self, elicitation_id: str) -> Optional[ElicitationStatus]:
+        """
+        Read only the status of an elicitation.
+
+        Args:
+            elicitation_id: Elicitation identifier
+
+        Returns:
+            ElicitationStatus or None if not found
+        """
+        try:
+            status = self.redis_client.hget(f"elicitation:{elicitation_id}", "status")
+            return ElicitationStatus(status) if status else None
+        except (redis.RedisError, ValueError) as e:
+            logger.error(f"Error reading elicitation status {elicitation_id}: {e}")
+            return None
+
+    def get_status_and_expiry(
+        self, elicitation_id: str
+    ) -> Optional[Tuple[ElicitationStatus, datetime, str]]:
+        """
+        Read only the fields needed to decide whether a response can be processed.
+
+        Uses HMGET so the schema and suspended arguments are not transferred or
+        parsed for responses that will be rejected anyway.
+
+        Args:
+            elicitation_id: Elicitation identifier
+
+        Returns:
+            (status, expires_at, session_id) or None if not found
+        """
+        try:
+            status, expires_at, session_id = self.redis_client.hmget(
+                f"elicitation:{elicitation_id}", "status", "expires_at", "session_id"
+            )
+            if not status or not expires_at:
+                return None
+            return ElicitationStatus(status), _from_timestamp(expires_at), session_id
+        except (redis.RedisError, ValueError) as e:
+            logger.error(f"Error reading elicitation status {elicitation_id}: {e}")
+            return None
+
+    async def wait_for_resolution(
+        self, elicitation_id: str, timeout: float
+    ) -> Optional[ElicitationStatus]:
+        """
+        Wait until an elicitation is completed, failed, expired or cancelled.
+
+        Resolutions made by this process wake the waiter immediately; otherwise the
+        status is read again when the timeout ends.
+
+        Args:
+            elicitation_id: Elicitation identifier
+            timeout: Seconds to wait at most
+
+        Returns:
+            The status at the end of the wait, or None if the elicitation is unknown
+        """
+        event = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), event)
+        with self._local_lock:
+            self._resolution_waiters.setdefault(elicitation_id, []).append(waiter)
+        try:
+            # Registered before the first read, so a resolution in between is not missed
+            status = await asyncio.to_thread(self.get_elicitation_status, elicitation_id)
+            if status is None or status in _RESOLVED_STATUSES:
+                return status
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            return await asyncio.to_thread(self.get_elicitation_status, elicitation_id)
+        finally:
+            with self._local_lock:
+                waiters = self._resolution_waiters.get(elicitation_id)
+                if waiters is not None and waiter in waiters:
+                    waiters.remove(waiter)
+                    if not waiters:
+                        del self._resolution_waiters[elicitation_id]
+
+    def _notify_resolved(self, elicitation_id: str):
+        """Wake in-process waiters for elicitation_id (safe to call from any thread)."""
+        with self._local_lock:
+            waiters = self._resolution_waiters.pop(elicitation_id, ())
+        for loop, event in waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(event.set)
+
     def delete_elicitation(self, elicitation_id: str) -> bool:
         """
         Delete elicitation from Redis.
@@ -227,8 +620,13 @@ class ElicitationManager:
         """
         key = f"elicitation:{elicitation_id}"
 
+        self._cache_invalidate(elicitation_id)
+
         try:
-            deleted = self.redis_client.delete(key)
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.delete(key)
+            pipe.zrem(_EXPIRY_INDEX_KEY, elicitation_id)
+            deleted, _ = pipe.execute()
             if deleted:
                 logger.info(f"Deleted elicitation {elicitation_id}")
             return deleted > 0
@@ -241,10 +639,12 @@ class ElicitationManager:
         queue_key = f"elicitation_queue:{session_id}"
 
         try:
+            pipe = self.redis_client.pipeline(transaction=False)
             # Add to left of list (FIFO queue when popping from right)
-            self.redis_client.lpush(queue_key, elicitation_id)
+            pipe.lpush(queue_key, elicitation_id)
             # Set expiration on queue (1 hour)
-            self.redis_client.expire(queue_key, 3600)
+            pipe.expire(queue_key, 3600)
+            pipe.execute()
             logger.debug(f"Added elicitation {elicitation_id} to queue for session {session_id}")
         except redis.RedisError as e:
             logger.error(f"Error adding to queue: {e}")
@@ -330,35 +730,21 @@ class ElicitationManager:
 
     def find_expired_elicitations(self) -> List[str]:
         """
-        Find all expired elicitations.
+        Find elicitations whose expiry time has passed.
+
+        Reads the expiry index rather than scanning every elicitation key, so the
+        cost depends on the number of expired entries, not on the keyspace. IDs may
+        still belong to elicitations that have since resolved or whose hash has been
+        evicted; mark_many_expired skips those and drops them from the index.
 
         Returns:
             List of expired elicitation IDs
         """
-        expired = []
-        now = datetime.utcnow()
-
         try:
-            # Scan for all elicitation keys
-            for key in self.redis_client.scan_iter("elicitation:*"):
-                data = self.redis_client.hgetall(key)
-                if not data:
-                    continue
-
-                status = data.get("status")
-                expires_at_str = data.get("expires_at")
-
-                if status == ElicitationStatus.PENDING.value and expires_at_str:
-                    expires_at = datetime.fromisoformat(expires_at_str)
-                    if now > expires_at:
-                        elicitation_id = data.get("elicitation_id")
-                        if elicitation_id:
-                            expired.append(elicitation_id)
-
+            return self.redis_client.zrangebyscore(_EXPIRY_INDEX_KEY, "-inf", time.time())
         except redis.RedisError as e:
             logger.error(f"Error finding expired elicitations: {e}")
-
-        return expired
+            return []
 
     def mark_expired(self, elicitation_id: str) -> bool:
         """
@@ -384,15 +770,100 @@ class ElicitationManager:
         logger.info(f"Marked elicitation {elicitation_id} as expired")
         return True
 
+    def mark_many_expired(self, elicitation_ids: List[str]) -> Dict[str, ElicitationState]:
+        """
+        Mark several elicitations as expired in two Redis round trips.
+
+        One pipeline reads every elicitation; one script call then expires the ones
+        still pending at that moment (checked atomically, so a response completed in
+        between keeps its status) and removes them from their session queues and the
+        expiry index.
+
+        Args:
+            elicitation_ids: Elicitation identifiers
+
+        Returns:
+            States of the elicitations that were marked expired, keyed by ID
+        """
+        if not elicitation_ids:
+            return {}
+
+        self._cache_invalidate(*elicitation_ids)
+
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for elicitation_id in elicitation_ids:
+                pipe.hgetall(f"elicitation:{elicitation_id}")
+            stored = pipe.execute()
+        except redis.RedisError as e:
+            logger.error(f"Error reading elicitations to expire: {e}")
+            return {}
+
+        # Every ID passed in is past its deadline or already resolved, so none of
+        # them needs to stay in the expiry index
+        stale = [
+            elicitation_id
+            for elicitation_id, data in zip(elicitation_ids, stored)
+            if not data or data.get("status") != ElicitationStatus.PENDING.value
+        ]
+        if stale:
+            try:
+                self.redis_client.zrem(_EXPIRY_INDEX_KEY, *stale)
+            except redis.RedisError as e:
+                logger.error(f"Error pruning expiry index: {e}")
+
+        states: Dict[str, ElicitationState] = {}
+        for elicitation_id, data in zip(elicitation_ids, stored):
+            if not data or data.get("status") != ElicitationStatus.PENDING.value:
+                continue
+            try:
+                states[elicitation_id] = self._parse_elicitation(data)
+            except (KeyError, ValueError) as e:
+                logger.error(f"Error parsing elicitation {elicitation_id}: {e}")
+
+        if not states:
+            return {}
+
+        keys = [_EXPIRY_INDEX_KEY]
+        for elicitation_id, state in states.items():
+            keys.append(f"elicitation:{elicitation_id}")
+            keys.append(f"elicitation_queue:{state.session_id}")
+        try:
+            flags = self._expire_pending_script(
+                keys=keys,
+                args=[ElicitationStatus.PENDING.value, ElicitationStatus.EXPIRED.value, *states],
+            )
+        except redis.RedisError as e:
+            logger.error(f"Error marking elicitations as expired: {e}")
+            return {}
+
+        # Drop the ones resolved since they were read
+        states = {
+            elicitation_id: state
+            for (elicitation_id, state), flag in zip(states.items(), flags)
+            if flag
+        }
+
+        for elicitation_id, state in states.items():
+            state.status = ElicitationStatus.EXPIRED
+            self._notify_resolved(elicitation_id)
+        logger.info(f"Marked {len(states)} elicitations as expired")
+        return states
+
 
 # Global elicitation manager instance
 _elicitation_manager: Optional[ElicitationManager] = None
+_elicitation_manager_lock = threading.Lock()
 
 
 def get_elicitation_manager() -> ElicitationManager:
     """Get or create the global elicitation manager instance."""
     global _elicitation_manager
     if _elicitation_manager is None:
-        _elicitation_manager = ElicitationManager()
+        # Built from worker threads too; waiters are only woken by the instance that
+        # resolves the elicitation, so there must be exactly one
+        with _elicitation_manager_lock:
+            if _elicitation_manager is None:
+                _elicitation_manager = ElicitationManager()
     return _elicitation_manager
 
@@ -6,6 +6,7 @@ This handler receives OTP/confirmation from the frontend and calls the MCP serve
 confirm_payment tool to complete the transaction.
 """
 
+import asyncio
 import json
 import logging
 from datetime import datetime
@@ -47,36 +48,48 @@ class ElicitationResponseHandler:
         logger.info(f"Handling elicitation response for {elicitation_id}")
 
         try:
-            # Step 1: Retrieve elicitation state from Redis
-            state = self.manager.get_elicitation(elicitation_id)
-            if not state:
+            # Step 1: Read status and expiry only; the full state is fetched once
+            # the response is known to be processable
+            summary = await asyncio.to_thread(self.manager.get_status_and_expiry, elicitation_id)
+            if not summary:
                 logger.error(f"Elicitation {elicitation_id} not found in Redis")
                 return {
                     "status": "error",
                     "error": "Elicitation not found or has expired"
                 }
+            status, expires_at, _ = summary
 
             # Step 2: Validate elicitation status
-            if state.status != ElicitationStatus.PENDING:
+            if status != ElicitationStatus.PENDING:
                 logger.error(
-                    f"Elicitation {elicitation_id} has invalid status: {state.status}"
+                    f"Elicitation {elicitation_id} has invalid status: {status}"
                 )
                 return {
                     "status": "error",
-                    "error": f"Elicitation is {state.status.value}, cannot process"
+                    "error": f"Elicitation is {status.value}, cannot process"
                 }
 
             # Step 3: Check if expired
-            if datetime.utcnow() > state.expires_at:
+            if datetime.utcnow() > expires_at:
                 logger.error(f"Elicitation {elicitation_id} has expired")
-                self.manager.mark_expired(elicitation_id)
+                await asyncio.to_thread(self.manager.mark_expired, elicitation_id)
                 return {
                     "status": "error",
                     "error": "Elicitation has expired. Please try again."
                 }
 
+            # Retrieve the full state needed to confirm the payment
+            state = await asyncio.to_thread(self.manager.get_elicitation, elicitation_id)
+            if not state:
+                logger.error(f"Elicitation {elicitation_id} not found in Redis")
+                return {
+                    "status": "error",
+                    "error": "Elicitation not found or has expired"
+                }
+
             # Step 4: Update status to processing
-            self.manager.update_elicitation_status(
+            await asyncio.to_thread(
+                self.manager.update_elicitation_status,
                 elicitation_id,
                 ElicitationStatus.PROCESSING
             )
@@ -91,11 +104,12 @@ class ElicitationResponseHandler:
 
             if result["status"] == "completed":
                 # Step 6: Mark as completed and clean up
-                self.manager.update_elicitation_status(
+                await asyncio.to_thread(
+                    self.manager.finalize,
                     elicitation_id,
+                    state.session_id,
                     ElicitationStatus.COMPLETED
                 )
-                self.manager.remove_from_queue(state.session_id, elicitation_id)
                 
                 logger.info(
                     f"Elicitation {elicitation_id} completed successfully: "
@@ -105,8 +119,10 @@ class ElicitationResponseHandler:
                 return result
             else:
                 # Step 7: Handle failure
-                self.manager.update_elicitation_status(
+                await asyncio.to_thread(
+                    self.manager.finalize,
                     elicitation_id,
+                    state.session_id,
                     ElicitationStatus.FAILED
                 )
                 
@@ -121,7 +137,8 @@ class ElicitationResponseHandler:
             
             # Update status to failed
             try:
-                self.manager.update_elicitation_status(
+                await asyncio.to_thread(
+                    self.manager.update_elicitation_status,
                     elicitation_id,
                     ElicitationStatus.FAILED
                 )
@@ -0,0 +1,37 @@
+"""
+Fast JSON helpers
+=================
+Uses orjson when it is installed (pip install "livekit-voice-agent[speedups]")
+and falls back to the standard library otherwise.
+
+dumps() always returns UTF-8 bytes, ready for data channel / Redis payloads.
+loads() accepts str, bytes, bytearray or memoryview.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can keep
+# catching json.JSONDecodeError regardless of the backend in use.
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+    """Deserialize JSON from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize obj to compact UTF-8 encoded JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
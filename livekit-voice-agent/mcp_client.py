@@ -5,10 +5,12 @@ Client for calling MCP server tools with JWT authentication.
 """
 
 import os
+import time
+import types
 import httpx
-import json
+import fast_json
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Mapping, Sequence
 from jose import jwt
 from dotenv import load_dotenv
 import logging
@@ -17,6 +19,31 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Signed tokens are reused until this many seconds before they expire, so a cached
+# token always has time left when it reaches the MCP server
+_JWT_EXPIRY_MARGIN_SECONDS = 15
+_JWT_CACHE_MAX_SIZE = 512
+
+_NO_ARGUMENTS: Mapping[str, Any] = types.MappingProxyType({})
+
+
+def _add_tool_arguments(out: Dict[str, Any], kwargs: Mapping[str, Any]):
+    """
+    Copy tool arguments into out in a single pass, dropping any caller-supplied
+    jwt_token and the None/""/{} values FastMCP would reject. Arguments an LLM nested
+    under a "kwargs" key (the name of the tool functions' ** parameter) are unwrapped.
+    """
+    for key, value in kwargs.items():
+        if key == "jwt_token" or value is None or value == "":
+            continue
+        if isinstance(value, dict):
+            if not value:
+                continue
+            if key == "kwargs":
+                _add_tool_arguments(out, value)
+                continue
+        out[key] = value
+
 
 class MCPClient:
     """Client for calling MCP server tools."""
@@ -27,26 +54,43 @@ class MCPClient:
         self.jwt_secret = os.getenv("MCP_JWT_SECRET_KEY", "your-secret-key-change-in-production")
         self.jwt_issuer = os.getenv("MCP_JWT_ISSUER", "orchestrator")
         self.jwt_algorithm = os.getenv("MCP_JWT_ALGORITHM", "HS256")
+        self.jwt_ttl_seconds = int(os.getenv("MCP_JWT_TTL_SECONDS", "300"))
+        self._jwt_reuse_seconds = max(self.jwt_ttl_seconds - _JWT_EXPIRY_MARGIN_SECONDS, 0)
         
         
-        # HTTP client with timeout and redirect following
-        # Configure with proper connection limits and keep-alive to prevent premature disconnections
-        self.client = httpx.AsyncClient(
-            timeout=httpx.Timeout(30.0, connect=10.0, read=30.0, write=10.0, pool=5.0),
-            base_url=self.mcp_url,
-            follow_redirects=True,  # Follow redirects (e.g., /mcp/ -> /mcp)
-            limits=httpx.Limits(
-                max_keepalive_connections=10,
-                max_connections=20,
-                keepalive_expiry=30.0
-            ),
-            http2=False  # Disable HTTP/2 to avoid streaming issues
-        )
+        # Shared HTTP client, created on first use (see the client property)
+        self._client: Optional[httpx.AsyncClient] = None
+        
+        # (user_id, scopes, session_id, email) -> (token, monotonic time it stops being reused)
+        self._jwt_cache: Dict[tuple, tuple] = {}
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        HTTP client shared by every tool call in this process.
+        Recreated if it was closed (e.g. by a previous job's shutdown), so callers
+        holding this MCPClient keep working.
+        """
+        if self._client is None or self._client.is_closed:
+            # HTTP client with timeout and redirect following
+            # Configure with proper connection limits and keep-alive to prevent premature disconnections
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(30.0, connect=10.0, read=30.0, write=10.0, pool=5.0),
+                base_url=self.mcp_url,
+                follow_redirects=True,  # Follow redirects (e.g., /mcp/ -> /mcp)
+                limits=httpx.Limits(
+                    max_keepalive_connections=50,
+                    max_connections=100,
+                    keepalive_expiry=30.0
+                ),
+                http2=False  # Disable HTTP/2 to avoid streaming issues
+            )
+        return self._client
     
     def _generate_jwt(
         self,
         user_id: str,
-        scopes: List[str],
+        scopes: Sequence[str],
         session_id: str,
         email: Optional[str] = None
     ) -> str:
@@ -55,14 +99,23 @@ class MCPClient:
         
         Args:
             user_id: User identifier
-            scopes: List of scopes (e.g., ['read'], ['transact'], ['configure'])
+            scopes: Sequence of scopes (e.g., ('read',), ('transact',), ('configure',))
             session_id: Session/room identifier
             email: User email address (optional but recommended)
             
         Returns:
             JWT token string
         """
+        # Reuse a recently signed token for the same identity and scopes; Agno often
+        # chains several tool calls per turn
+        cache_key = (user_id, tuple(scopes), session_id, email)
+        cached = self._jwt_cache.get(cache_key)
+        now_monotonic = time.monotonic()
+        if cached is not None and cached[1] > now_monotonic:
+            return cached[0]
+        
         now = datetime.utcnow()
+        scopes = list(scopes)  # Callers may pass tuples; the claims stay JSON arrays
         payload = {
             "iss": self.jwt_issuer,
             "sub": user_id,
@@ -71,7 +124,7 @@ class MCPClient:
             "roles": ["customer"],  # Default role for Next.js API
             "session_id": session_id,
             "iat": now,
-            "exp": now + timedelta(minutes=5),  # 5 minute expiration
+            "exp": now + timedelta(seconds=self.jwt_ttl_seconds),  # 5 minute expiration by default
             "jti": f"{user_id}-{now.timestamp()}"
         }
         
@@ -94,6 +147,15 @@ class MCPClient:
             algorithm=self.jwt_algorithm
         )
         
+        if len(self._jwt_cache) >= _JWT_CACHE_MAX_SIZE:
+            # Drop expired entries, or everything if all are still live
+            self._jwt_cache = {
+                key: entry for key, entry in self._jwt_cache.items() if entry[1] > now_monotonic
+            }
+            if len(self._jwt_cache) >= _JWT_CACHE_MAX_SIZE:
+                self._jwt_cache.clear()
+        self._jwt_cache[cache_key] = (token, now_monotonic + self._jwt_reuse_seconds)
+        
         return token
     
     async def _call_mcp_tool(
@@ -101,8 +163,10 @@ class MCPClient:
         tool_name: str,
         user_id: str,
         session_id: str,
-        scopes: List[str],
+        scopes: Sequence[str],
         email: Optional[str] = None,
+        *,
+        arguments: Mapping[str, Any] = _NO_ARGUMENTS,
         **kwargs
     ) -> Any:
         """
@@ -114,7 +178,8 @@ class MCPClient:
             session_id: Session/room identifier
             scopes: Required scopes for this operation
             email: User email address (optional but recommended)
-            **kwargs: Tool-specific parameters
+            arguments: Tool-specific parameters as a mapping (avoids ** re-packing)
+            **kwargs: Tool-specific parameters (merged after arguments)
             
         Returns:
             Tool response
@@ -124,16 +189,11 @@ class MCPClient:
         # Build tool arguments
         # Include jwt_token in arguments for tools that require it as a parameter
         # Also send in headers for tools that read from headers
-        # Filter out None values and empty strings to avoid FastMCP validation errors
-        filtered_kwargs = {
-            k: v for k, v in kwargs.items()
-            if v is not None and v != "" and not (isinstance(v, dict) and len(v) == 0)
-        }
-        
-        tool_arguments = {
-            "jwt_token": jwt_token,
-            **filtered_kwargs
-        }
+        tool_arguments = {"jwt_token": jwt_token}
+        if arguments:
+            _add_tool_arguments(tool_arguments, arguments)
+        if kwargs:
+            _add_tool_arguments(tool_arguments, kwargs)
         
         # FastMCP uses JSON-RPC 2.0 protocol
         # POST to base MCP path with JSON-RPC request
@@ -161,25 +221,21 @@ class MCPClient:
             
             # Make request and ensure full response is consumed
             # This prevents the connection from closing before the server finishes writing
+            # The body is encoded with fast_json (orjson when installed) and sent as bytes
             response = await self.client.post(
                 "",
-                json=jsonrpc_request,
+                content=fast_json.dumps(jsonrpc_request),
                 headers=headers
             )
             
             response.raise_for_status()
             
-            # Read the full response content
-            # Using .text property reads the entire response body synchronously
-            # This ensures all data is received before the connection can be closed
-            # The response object will be automatically cleaned up after we're done
-            response_text = response.text
-            
-            # Parse JSON-RPC response
+            # Parse JSON-RPC response straight from the raw body bytes
+            # (.content has already read the entire response)
             try:
-                jsonrpc_response = json.loads(response_text)
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON response: {e}, response text: {response_text[:200]}")
+                jsonrpc_response = fast_json.loads(response.content)
+            except fast_json.JSONDecodeError as e:
+                logger.error(f"Failed to parse JSON response: {e}, response text: {response.text[:200]}")
                 raise ValueError(f"Invalid JSON response from MCP server: {e}")
             
             # Check for JSON-RPC errors
@@ -361,7 +417,9 @@ class MCPClient:
     
     async def close(self):
         """Close HTTP client."""
-        await self.client.aclose()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
 
 # Global MCP client instance
@@ -375,3 +433,8 @@ def get_mcp_client() -> MCPClient:
         _mcp_client = MCPClient()
     return _mcp_client
 
+
+async def close_mcp_client():
+    """Close the global MCP client's connections (e.g. on job shutdown)."""
+    if _mcp_client is not None:
+        await _mcp_client.close()
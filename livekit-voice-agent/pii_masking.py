@@ -3,9 +3,17 @@ PII Masking Module using Presidio
 ==================================
 Optional PII masking functionality for the LiveKit voice agent.
 Can be enabled/disabled via ENABLE_PII_MASKING environment variable.
+Set FAST_PII=true to use precompiled regexes instead of Presidio (much faster,
+covers structured PII only: emails, cards, SSNs, phone numbers, IBANs).
+Set PII_ENGINE=re2 to run the fast engine on google-re2 (linear-time matching)
+when it is installed.
+Set PII_SPACY_MODEL (e.g. en_core_web_sm) to load a different spaCy model into
+Presidio than its default en_core_web_lg.
 """
 
+import functools
 import os
+import re
 from typing import Optional
 import logging
 
@@ -14,7 +22,55 @@ logger = logging.getLogger(__name__)
 # Global analyzer and anonymizer instances (lazy-loaded)
 _analyzer = None
 _anonymizer = None
+_anonymizer_operators = None
 _pii_masking_enabled = None
+_fast_pii_enabled = None
+
+# Entities Presidio is asked to detect
+_PRESIDIO_ENTITIES = [
+    "OTP",
+    "PERSON",
+    "EMAIL_ADDRESS",
+    "PHONE_NUMBER",
+    "CREDIT_CARD",
+    "SSN",
+    "IBAN_CODE",
+    "US_DRIVER_LICENSE",
+    "US_PASSPORT",
+    "US_BANK_NUMBER",
+]
+
+# Distinct texts whose Presidio result is kept (see _sanitize_text_presidio)
+_SANITIZE_CACHE_SIZE = 4096
+
+# Every entity above contains a letter or digit; chunks without one (punctuation,
+# whitespace) are returned without running spaCy
+_PII_CANDIDATE_RE = re.compile(r"[^\W_]")
+
+# Regex engine for the fast path: google-re2 guarantees linear-time matching on long
+# LLM outputs; the stdlib engine is used when re2 is not requested or not installed.
+if os.getenv("PII_ENGINE", "re").lower() == "re2":
+    try:
+        import re2 as _regex_engine
+    except ImportError:
+        logger.warning("PII_ENGINE=re2 but google-re2 is not installed, using re. Install with: pip install google-re2")
+        _regex_engine = re
+else:
+    _regex_engine = re
+
+# Regex patterns for the fast engine, keyed by Presidio entity name.
+# Order matters: longer/more specific patterns are tried first.
+# Patterns avoid lookarounds and backreferences so they also compile under re2.
+_FAST_PII_PATTERNS = {
+    "EMAIL_ADDRESS": r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+",
+    "IBAN_CODE": r"\b[A-Z]{2}\d{2}(?: ?[A-Z0-9]{4}){2,7}(?: ?[A-Z0-9]{1,4})?\b",
+    "CREDIT_CARD": r"\b(?:\d[ -]?){12,18}\d\b",
+    "SSN": r"\b\d{3}-\d{2}-\d{4}\b",
+    "PHONE_NUMBER": r"(?:\+?\b\d{1,3}[ .-]?)?(?:\(\d{3}\)|\b\d{3})[ .-]?\d{3}[ .-]?\d{4}\b",
+}
+_FAST_PII_RE = _regex_engine.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, pattern in _FAST_PII_PATTERNS.items())
+)
 
 
 def is_pii_masking_enabled() -> bool:
@@ -25,6 +81,51 @@ def is_pii_masking_enabled() -> bool:
     return _pii_masking_enabled
 
 
+def is_fast_pii_enabled() -> bool:
+    """Check if the regex PII engine should be used instead of Presidio."""
+    global _fast_pii_enabled
+    if _fast_pii_enabled is None:
+        _fast_pii_enabled = os.getenv("FAST_PII", "false").lower() in ("true", "1", "yes")
+    return _fast_pii_enabled
+
+
+def _luhn_ok(digits: str) -> bool:
+    """Luhn checksum, used to tell card numbers apart from other long digit runs."""
+    total = 0
+    for i, ch in enumerate(reversed(digits)):
+        d = ord(ch) - 48
+        if i % 2:
+            d *= 2
+            if d > 9:
+                d -= 9
+        total += d
+    return total % 10 == 0
+
+
+def _sanitize_text_fast(text: str) -> str:
+    """Mask structured PII with the precompiled regex engine."""
+    redacted = 0
+    
+    def _mask_match(match) -> str:
+        # Cards keep their last four digits; digit runs failing Luhn are not cards
+        # (same validation Presidio's credit card recognizer applies)
+        nonlocal redacted
+        value = match.group()
+        if match.lastgroup == "CREDIT_CARD":
+            digits = value.replace(" ", "").replace("-", "")
+            if not _luhn_ok(digits):
+                return value
+            redacted += 1
+            return f"[REDACTED] ending in {digits[-4:]}"
+        redacted += 1
+        return "[REDACTED]"
+    
+    sanitized = _FAST_PII_RE.sub(_mask_match, text)
+    if redacted:
+        logger.info(f"🛡️ Guardrail triggered. Redacted {redacted} entities.")
+    return sanitized
+
+
 def get_analyzer():
     """
     Get Presidio Analyzer instance (lazy-loaded).
@@ -38,7 +139,16 @@ def get_analyzer():
     if _analyzer is None:
         try:
             from presidio_analyzer import AnalyzerEngine
-            _analyzer = AnalyzerEngine()
+            spacy_model = os.getenv("PII_SPACY_MODEL")
+            if spacy_model:
+                from presidio_analyzer.nlp_engine import NlpEngineProvider
+                nlp_engine = NlpEngineProvider(nlp_configuration={
+                    "nlp_engine_name": "spacy",
+                    "models": [{"lang_code": "en", "model_name": spacy_model}],
+                }).create_engine()
+                _analyzer = AnalyzerEngine(nlp_engine=nlp_engine, supported_languages=["en"])
+            else:
+                _analyzer = AnalyzerEngine()
             logger.info("Presidio Analyzer initialized successfully")
         except ImportError:
             logger.warning(
@@ -58,7 +168,7 @@ def get_anonymizer():
     Get Presidio Anonymizer instance (lazy-loaded).
     Returns None if PII masking is disabled or Presidio is not available.
     """
-    global _anonymizer
+    global _anonymizer, _anonymizer_operators
     
     if not is_pii_masking_enabled():
         return None
@@ -68,6 +178,7 @@ def get_anonymizer():
             from presidio_anonymizer import AnonymizerEngine
             from presidio_anonymizer.entities import OperatorConfig
             _anonymizer = AnonymizerEngine()
+            _anonymizer_operators = {"DEFAULT": OperatorConfig("replace", {"new_value": "[REDACTED]"})}
             logger.info("Presidio Anonymizer initialized successfully")
         except ImportError:
             logger.warning(
@@ -82,9 +193,27 @@ def get_anonymizer():
     return _anonymizer
 
 
+def warm_up():
+    """
+    Load the configured PII engine ahead of the first real call (e.g. in a worker's
+    prewarm), so spaCy model loading is not paid on a user's first turn.
+    No-op when masking is disabled or the regex engine is used.
+    """
+    if not is_pii_masking_enabled() or is_fast_pii_enabled():
+        return
+    analyzer = get_analyzer()
+    if analyzer is None or get_anonymizer() is None:
+        return
+    try:
+        # The first analyze() call finishes setting up the NLP pipeline
+        analyzer.analyze(text="Warm up the analyzer.", entities=_PRESIDIO_ENTITIES, language='en')
+    except Exception as e:
+        logger.error(f"Presidio warm-up failed: {e}")
+
+
 def sanitize_text(text: str) -> str:
     """
-    Sanitize text by masking PII using Presidio.
+    Sanitize text by masking PII using Presidio (or the regex engine if FAST_PII is set).
     
     Args:
         text: Text to sanitize
@@ -92,13 +221,16 @@ def sanitize_text(text: str) -> str:
     Returns:
         Sanitized text with PII masked, or original text if masking is disabled/failed
     """
-    if not text or text.strip() == "":
+    if not text or not _PII_CANDIDATE_RE.search(text):
         return text
     
     # If PII masking is disabled, return text as-is
     if not is_pii_masking_enabled():
         return text
     
+    if is_fast_pii_enabled():
+        return _sanitize_text_fast(text)
+    
     # Get analyzer and anonymizer
     analyzer = get_analyzer()
     anonymizer = get_anonymizer()
@@ -108,40 +240,39 @@ def sanitize_text(text: str) -> str:
         return text
     
     try:
-        # 1. Analyze (Detect PII)
-        # Include OTP and other sensitive entities
-        results = analyzer.analyze(
-            text=text,
-            entities=[
-                "OTP",
-                "PERSON",
-                "EMAIL_ADDRESS",
-                "PHONE_NUMBER",
-                "CREDIT_CARD",
-                "SSN",
-                "IBAN_CODE",
-                "US_DRIVER_LICENSE",
-                "US_PASSPORT",
-                "US_BANK_NUMBER",
-            ],
-            language='en'
-        )
-        
-        # 2. Anonymize (Redact PII)
-        from presidio_anonymizer.entities import OperatorConfig
-        anonymized_result = anonymizer.anonymize(
-            text=text,
-            analyzer_results=results,
-            operators={"DEFAULT": OperatorConfig("replace", {"new_value": "[REDACTED]"})}
-        )
-        
-        if len(results) > 0:
-            logger.info(f"🛡️ Guardrail triggered. Redacted {len(results)} entities.")
-        
-        return anonymized_result.text
-        
+        return _sanitize_text_presidio(text)
     except Exception as e:
         logger.error(f"Error during PII masking: {e}")
         # Return original text if masking fails
         return text
 
+
+@functools.lru_cache(maxsize=_SANITIZE_CACHE_SIZE)
+def _sanitize_text_presidio(text: str) -> str:
+    """
+    Mask PII with Presidio (analyzer/anonymizer must already be initialized).
+    
+    Results are cached: the assistant repeats the same sentences often (and llm_node
+    and tts_node sanitize the same segments), and Presidio output is deterministic
+    for a given text. Failures raise and are therefore never cached.
+    See _sanitize_text_presidio.cache_info() for the hit rate.
+    """
+    # 1. Analyze (Detect PII)
+    # Include OTP and other sensitive entities
+    results = _analyzer.analyze(
+        text=text,
+        entities=_PRESIDIO_ENTITIES,
+        language='en'
+    )
+    
+    # 2. Anonymize (Redact PII)
+    anonymized_result = _anonymizer.anonymize(
+        text=text,
+        analyzer_results=results,
+        operators=_anonymizer_operators
+    )
+    
+    if len(results) > 0:
+        logger.info(f"🛡️ Guardrail triggered. Redacted {len(results)} entities.")
+    
+    return anonymized_result.text
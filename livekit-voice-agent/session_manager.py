@@ -5,16 +5,26 @@ Manages user sessions in Redis, storing user identity, session metadata,
 and conversation context for the voice assistant.
 """
 
+import asyncio
 import json
 import os
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 import redis
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
+def _encode_updates(updates: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert list/dict values to JSON strings for storage in a Redis hash."""
+    return {
+        key: json.dumps(value) if isinstance(value, (list, dict)) else value
+        for key, value in updates.items()
+    }
+
+
 class SessionManager:
     """Manages Redis sessions for voice assistant users."""
 
@@ -76,10 +86,12 @@ class SessionManager:
             "platform": platform,
         }
 
-        # Set session with 1 hour TTL
+        # Set session with 1 hour TTL (both commands sent in one round trip)
         try:
-            self.redis_client.hset(session_key, mapping=session_data)
-            self.redis_client.expire(session_key, 3600)  # 1 hour
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.hset(session_key, mapping=session_data)
+            pipe.expire(session_key, 3600)  # 1 hour
+            pipe.execute()
             print(f"Created session: {session_key}")
             return session_key
         except redis.RedisError as e:
@@ -132,20 +144,32 @@ class SessionManager:
         session_key = f"session:{room_name}:{user_id}"
 
         try:
-            # Convert lists to JSON strings if needed
-            processed_updates = {}
-            for key, value in updates.items():
-                if isinstance(value, (list, dict)):
-                    processed_updates[key] = json.dumps(value)
-                else:
-                    processed_updates[key] = value
-
-            self.redis_client.hset(session_key, mapping=processed_updates)
+            self.redis_client.hset(session_key, mapping=_encode_updates(updates))
             return True
         except redis.RedisError as e:
             print(f"Error updating session: {e}")
             return False
 
+    def update_sessions(self, updates_by_session: Dict[Tuple[str, str], Dict[str, Any]]) -> bool:
+        """
+        Update several sessions in one Redis round trip.
+
+        Args:
+            updates_by_session: Fields to update, keyed by (room_name, user_id)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for (room_name, user_id), updates in updates_by_session.items():
+                pipe.hset(f"session:{room_name}:{user_id}", mapping=_encode_updates(updates))
+            pipe.execute()
+            return True
+        except redis.RedisError as e:
+            print(f"Error updating sessions: {e}")
+            return False
+
     def delete_session(self, room_name: str, user_id: str) -> bool:
         """
         Delete a session from Redis.
@@ -187,6 +211,70 @@ class SessionManager:
             return False
 
 
+class SessionWriteBehind:
+    """
+    Coalesces session updates made within a short window into one Redis round trip.
+
+    Updates for the same session are merged (later fields win). Updates whose write
+    fails stay queued for the next write. Must be used from the event loop; the write
+    itself runs in a worker thread.
+    """
+
+    def __init__(self, session_manager: SessionManager, delay: float = 0.05):
+        """
+        Args:
+            session_manager: Session manager used to write the merged updates
+            delay: Seconds to wait for further updates before writing
+        """
+        self.session_manager = session_manager
+        self.delay = delay
+        self._pending: Dict[Tuple[str, str], Dict[str, Any]] = defaultdict(dict)
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # Held so the event loop's weak reference is not the only one mid-write
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def schedule(self, room_name: str, user_id: str, updates: Dict[str, Any]):
+        """Queue fields to update on a session; written within `delay` seconds."""
+        self._pending[(room_name, user_id)].update(updates)
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.delay, self._start_write
+            )
+
+    def _start_write(self):
+        """Timer callback: write the queued updates in a task kept on self."""
+        self._flush_handle = None
+        self._flush_task = asyncio.create_task(self._write())
+
+    async def flush(self):
+        """Write all queued updates now (also call on shutdown)."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._flush_task is not None:
+            await self._flush_task
+            self._flush_task = None
+        await self._write()
+        if self._pending:
+            print(f"Dropping session updates that could not be written: {list(self._pending)}")
+
+    async def _write(self):
+        """Write the queued updates, keeping them queued if the write fails."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, defaultdict(dict)
+        try:
+            written = await asyncio.to_thread(self.session_manager.update_sessions, pending)
+        except Exception as e:
+            print(f"Error flushing session updates: {e}")
+            written = False
+        if not written:
+            # Re-queue for the next write; fields queued since then are newer and win
+            for key, updates in pending.items():
+                self._pending[key] = {**updates, **self._pending.get(key, {})}
+            print(f"Kept session updates for retry: {list(pending)}")
+
+
 # Global session manager instance
 _session_manager: Optional[SessionManager] = None
 
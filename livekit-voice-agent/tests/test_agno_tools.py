@@ -0,0 +1,28 @@
+"""
+Tests for the tool set AuthenticatedMCPTools offers to Agno.
+"""
+
+import pytest
+
+pytest.importorskip("agno")
+
+from agno_tools import create_agno_mcp_tools
+
+
+def _tool_names(**kwargs):
+    return {function.name for function in create_agno_mcp_tools("user", "session", **kwargs).get_tools()}
+
+
+def test_await_elicitation_is_opt_in():
+    names = _tool_names()
+    assert "initiate_payment" in names
+    assert "await_elicitation" not in names
+
+
+def test_await_elicitation_registered_when_enabled():
+    assert "await_elicitation" in _tool_names(await_elicitation=True)
+
+
+def test_await_elicitation_needs_the_payments_group():
+    assert "await_elicitation" not in _tool_names(groups=("read",), await_elicitation=True)
+    assert "await_elicitation" in _tool_names(groups=("payments",), await_elicitation=True)
@@ -0,0 +1,83 @@
+"""
+Tests for agent._mask_by_sentence, the sentence re-chunker that feeds the PII
+masker in both llm_node and tts_node.
+"""
+
+import re
+
+import pytest
+
+pytest.importorskip("livekit.agents")
+
+import pii_masking
+from agent import _TTS_MAX_BUFFER_CHARS, _mask_by_sentence
+
+
+async def _stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _segments(*chunks, mask=lambda text: text):
+    """Run chunks through _mask_by_sentence and return the segments passed to mask."""
+    seen = []
+
+    def record(text):
+        seen.append(text)
+        return mask(text)
+
+    output = [segment async for segment in _mask_by_sentence(_stream(*chunks), record)]
+    assert output == [mask(text) for text in seen]
+    return seen
+
+
+async def test_splits_on_sentence_ends():
+    segments = await _segments("Hello there. How ", "are you? Fine")
+    assert segments == ["Hello there.", " How are you?", " Fine"]
+
+
+async def test_card_number_split_across_chunks_is_masked_whole():
+    chunks = ("Your card 4111 1111 ", "1111 1111 is on file. ", "Anything else?")
+    segments = await _segments(*chunks, mask=pii_masking._sanitize_text_fast)
+
+    assert any("4111 1111 1111 1111" in segment for segment in segments)
+    masked = "".join(pii_masking._sanitize_text_fast(segment) for segment in segments)
+    assert "4111 1111" not in masked
+    assert "[REDACTED] ending in 1111" in masked
+
+
+async def test_decimal_amount_is_not_a_sentence_end():
+    segments = await _segments("That costs $3.", "50 today. Bye")
+    assert segments == ["That costs $3.50 today.", " Bye"]
+
+
+async def test_terminator_waits_for_following_whitespace():
+    # "3." at the end of a chunk may still be "3.50"; only a space makes it an end
+    segments = await _segments("Total: 3.", " Done")
+    assert segments == ["Total: 3.", " Done"]
+
+
+async def test_long_text_without_terminator_flushes_at_word_break():
+    text = "word " * (_TTS_MAX_BUFFER_CHARS // 5) + "card 4111 1111 1111 1111 more"
+    segments = await _segments(*re.findall(r"\S+\s*", text))
+
+    # Flushed before the stream ended, at word breaks, never inside the spaced digits
+    assert len(segments) > 1
+    assert "".join(segments) == text
+    assert all(segment.endswith(" ") for segment in segments[:-1])
+    assert any("4111 1111 1111 1111" in segment for segment in segments)
+
+
+async def test_long_text_is_cut_at_soft_break_next_to_digits():
+    text = "x" * _TTS_MAX_BUFFER_CHARS + " then 4111 1111 1111 1111"
+    segments = await _segments(text)
+    assert segments[0].endswith(" ")
+    assert "4111 1111 1111 1111" in segments[-1]
+
+
+async def test_tail_without_terminator_is_flushed_at_end():
+    assert await _segments("no terminator", " here") == ["no terminator here"]
+
+
+async def test_empty_stream_yields_nothing():
+    assert await _segments() == []
@@ -0,0 +1,27 @@
+"""
+The voice agent must speak a payment outcome exactly once: handle_elicitation_response
+narrates it when the client answers the elicitation, and llm_node drops model text
+after an elicitation, so the Agno agent must not be offered a second path
+(await_elicitation) that reports the same outcome from inside the run.
+"""
+
+import types
+
+import pytest
+
+pytest.importorskip("livekit.agents")
+pytest.importorskip("agno")
+
+import agent
+
+
+def test_voice_agent_has_no_await_elicitation_tool(monkeypatch):
+    monkeypatch.setattr(agent, "_get_model", lambda model_id: None)
+    monkeypatch.setattr(agent, "_get_db", lambda: None)
+    assistant = types.SimpleNamespace(user_id="user", session_id="session")
+
+    agno_agent = agent.Assistant._build_agno_agent(assistant)
+
+    names = {function.name for function in agno_agent.tools}
+    assert "initiate_payment" in names
+    assert "await_elicitation" not in names
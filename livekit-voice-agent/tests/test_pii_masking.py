@@ -0,0 +1,69 @@
+"""
+Tests for the regex PII engine (FAST_PII) in pii_masking.
+"""
+
+import pytest
+
+import pii_masking
+
+
+@pytest.mark.parametrize(
+    "digits, valid",
+    [
+        ("4111111111111111", True),
+        ("5500000000000004", True),
+        ("4111111111111112", False),
+        ("1234567890123456", False),
+    ],
+)
+def test_luhn_ok(digits, valid):
+    assert pii_masking._luhn_ok(digits) is valid
+
+
+@pytest.mark.parametrize(
+    "card",
+    ["4111111111111111", "4111 1111 1111 1111", "4111-1111-1111-1111"],
+)
+def test_fast_engine_masks_cards_keeping_last_four(card):
+    masked = pii_masking._sanitize_text_fast(f"Card {card} is active.")
+    assert masked == "Card [REDACTED] ending in 1111 is active."
+
+
+def test_fast_engine_keeps_digit_runs_that_fail_luhn():
+    text = "Reference 1234 5678 9012 3456 is noted."
+    assert pii_masking._sanitize_text_fast(text) == text
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Mail jane.doe+bank@example.co.uk today", "Mail [REDACTED] today"),
+        ("SSN 123-45-6789 on file", "SSN [REDACTED] on file"),
+        ("Call (555) 123-4567 now", "Call [REDACTED] now"),
+        ("Call +1 555-123-4567 now", "Call [REDACTED] now"),
+        ("IBAN GB82 WEST 1234 5698 7654 32 used", "IBAN [REDACTED] used"),
+    ],
+)
+def test_fast_engine_masks_structured_pii(text, expected):
+    assert pii_masking._sanitize_text_fast(text) == expected
+
+
+def test_fast_engine_leaves_amounts_alone():
+    text = "You paid $3.50 and $1,000.00 this week."
+    assert pii_masking._sanitize_text_fast(text) == text
+
+
+def test_sanitize_text_uses_fast_engine_when_enabled(monkeypatch):
+    monkeypatch.setattr(pii_masking, "_pii_masking_enabled", True)
+    monkeypatch.setattr(pii_masking, "_fast_pii_enabled", True)
+    assert pii_masking.sanitize_text("SSN 123-45-6789") == "SSN [REDACTED]"
+
+
+def test_sanitize_text_is_a_no_op_when_disabled(monkeypatch):
+    monkeypatch.setattr(pii_masking, "_pii_masking_enabled", False)
+    assert pii_masking.sanitize_text("SSN 123-45-6789") == "SSN 123-45-6789"
+
+
+def test_sanitize_text_skips_text_without_letters_or_digits(monkeypatch):
+    monkeypatch.setattr(pii_masking, "_pii_masking_enabled", True)
+    assert pii_masking.sanitize_text(" ... ") == " ... "